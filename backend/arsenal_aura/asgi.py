@@ -4,3 +4,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "arsenal_aura.settings")
 
 application = get_asgi_application()
+
+from core.chat import keyword_index  # noqa: E402
+
+keyword_index.warm()
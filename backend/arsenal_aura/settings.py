@@ -98,6 +98,7 @@ REST_FRAMEWORK = {
         "fixtures": "12/min",
         "generate": "30/min",
         "chat": "60/min",
+        "bootstrap": "30/min",
     },
 }
 
@@ -106,6 +107,7 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": False,
+    "TOKEN_USER_CLASS": "core.authentication.ClaimsUser",
 }
 
 CORS_ALLOWED_ORIGINS = [o.strip() for o in os.environ.get("CORS_ALLOWED_ORIGINS", "").split(",") if o.strip()]
@@ -122,8 +124,57 @@ if os.environ.get("ALLOW_VERCEL_PREVIEWS", "").lower() == "true":
     CSRF_TRUSTED_ORIGINS.append("https://*.vercel.app")
 
 FOOTBALL_DATA_API_KEY = os.environ.get("FOOTBALL_DATA_API_KEY", "")
+FOOTBALL_DATA_BASE_URL = os.environ.get("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
 SPORTS_DB_API_KEY = os.environ.get("SPORTS_DB_API_KEY", "")
+SPORTS_DB_BASE_URL = os.environ.get("SPORTS_DB_BASE_URL", "https://www.thesportsdb.com/api/v1/json")
+UPSTREAM_CONNECT_TIMEOUT = float(os.environ.get("UPSTREAM_CONNECT_TIMEOUT", "3.05"))
+UPSTREAM_READ_TIMEOUT = float(os.environ.get("UPSTREAM_READ_TIMEOUT", "15"))
+UPSTREAM_RETRIES = int(os.environ.get("UPSTREAM_RETRIES", "3"))
+UPSTREAM_BACKOFF_SECONDS = float(os.environ.get("UPSTREAM_BACKOFF_SECONDS", "0.5"))
+UPSTREAM_BACKOFF_MAX_SECONDS = float(os.environ.get("UPSTREAM_BACKOFF_MAX_SECONDS", "8"))
+UPSTREAM_BREAKER_THRESHOLD = int(os.environ.get("UPSTREAM_BREAKER_THRESHOLD", "5"))
+UPSTREAM_BREAKER_RESET_SECONDS = int(os.environ.get("UPSTREAM_BREAKER_RESET_SECONDS", "30"))
+UPSTREAM_POOL_SIZE = int(os.environ.get("UPSTREAM_POOL_SIZE", "10"))
 CACHE_TTL_MINUTES = int(os.environ.get("CACHE_TTL_MINUTES", "10"))
+BADGE_FETCH_WORKERS = int(os.environ.get("BADGE_FETCH_WORKERS", "4"))
+SAMPLER_TTL_SECONDS = int(os.environ.get("SAMPLER_TTL_SECONDS", "300"))
+CHAT_TOP_K = int(os.environ.get("CHAT_TOP_K", "2"))
+CONTENT_SNAPSHOT_TTL_SECONDS = int(os.environ.get("CONTENT_SNAPSHOT_TTL_SECONDS", "300"))
+CONTENT_MAX_AGE_SECONDS = int(os.environ.get("CONTENT_MAX_AGE_SECONDS", "60"))
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", str(SERVER_MODE == "asgi")).lower() == "true"
+PROFILE_CACHE_ALIAS = os.environ.get("PROFILE_CACHE_ALIAS", "default")
+PROFILE_CACHE_VERSION = int(os.environ.get("PROFILE_CACHE_VERSION", "1"))
+PROFILE_CACHE_TTL_SECONDS = int(os.environ.get("PROFILE_CACHE_TTL_SECONDS", "300"))
+BOOTSTRAP_WORKERS = int(os.environ.get("BOOTSTRAP_WORKERS", "4"))
+BOOTSTRAP_TIMEOUT_SECONDS = float(os.environ.get("BOOTSTRAP_TIMEOUT_SECONDS", "10"))
+HISTORY_DEDUPE_SIZE = int(os.environ.get("HISTORY_DEDUPE_SIZE", "20"))
+HISTORY_CACHE_USERS = int(os.environ.get("HISTORY_CACHE_USERS", "10000"))
+HISTORY_RETENTION_PER_USER = int(os.environ.get("HISTORY_RETENTION_PER_USER", "200"))
+HISTORY_RETENTION_DAYS = int(os.environ.get("HISTORY_RETENTION_DAYS", "90"))
+WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND_ENABLED", "True").lower() == "true"
+WRITE_BEHIND_POLICY = os.environ.get("WRITE_BEHIND_POLICY", "drop")
+WRITE_BEHIND_MAX_QUEUE = int(os.environ.get("WRITE_BEHIND_MAX_QUEUE", "10000"))
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_SECONDS = float(os.environ.get("WRITE_BEHIND_FLUSH_SECONDS", "1.0"))
+WRITE_BEHIND_BLOCK_SECONDS = float(os.environ.get("WRITE_BEHIND_BLOCK_SECONDS", "0.05"))
+WRITE_BEHIND_RETRIES = int(os.environ.get("WRITE_BEHIND_RETRIES", "2"))
+WRITE_BEHIND_RETRY_SECONDS = float(os.environ.get("WRITE_BEHIND_RETRY_SECONDS", "0.2"))
+FIXTURES_CACHE_BACKEND = os.environ.get("FIXTURES_CACHE_BACKEND", "database")
+FIXTURES_CACHE_ALIAS = os.environ.get("FIXTURES_CACHE_ALIAS", "default")
+FIXTURES_CACHE_LRU_SIZE = int(os.environ.get("FIXTURES_CACHE_LRU_SIZE", "256"))
+FIXTURES_CACHE_RETENTION_DAYS = int(os.environ.get("FIXTURES_CACHE_RETENTION_DAYS", "7"))
+UPSTREAM_WAIT_TIMEOUT_SECONDS = int(os.environ.get("UPSTREAM_WAIT_TIMEOUT_SECONDS", "30"))
+CACHE_REFRESH_MARGIN_SECONDS = int(os.environ.get("CACHE_REFRESH_MARGIN_SECONDS", "120"))
+CACHE_WARM_INTERVAL_SECONDS = int(os.environ.get("CACHE_WARM_INTERVAL_SECONDS", "60"))
+FIXTURE_SCHEDULE_ENABLED = os.environ.get("FIXTURE_SCHEDULE_ENABLED", "True").lower() == "true"
+FIXTURE_FULL_SYNC_HOURS = int(os.environ.get("FIXTURE_FULL_SYNC_HOURS", "24"))
+FIXTURE_SYNC_WINDOW_DAYS = int(os.environ.get("FIXTURE_SYNC_WINDOW_DAYS", "14"))
+FIXTURE_POLL_IDLE_SECONDS = int(os.environ.get("FIXTURE_POLL_IDLE_SECONDS", "21600"))
+FIXTURE_POLL_LIVE_SECONDS = int(os.environ.get("FIXTURE_POLL_LIVE_SECONDS", "60"))
+FIXTURE_PREMATCH_MINUTES = int(os.environ.get("FIXTURE_PREMATCH_MINUTES", "60"))
+FIXTURE_MATCH_MINUTES = int(os.environ.get("FIXTURE_MATCH_MINUTES", "150"))
+FIXTURE_STALE_SECONDS = int(os.environ.get("FIXTURE_STALE_SECONDS", "43200"))
 ARSENAL_TEAM_ID = os.environ.get("ARSENAL_TEAM_ID", "")
 ADMIN_BOOTSTRAP_TOKEN = os.environ.get("ADMIN_BOOTSTRAP_TOKEN", "")
 ADMIN_BOOTSTRAP_EMAIL = os.environ.get("ADMIN_BOOTSTRAP_EMAIL", "")
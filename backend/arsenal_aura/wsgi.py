@@ -4,3 +4,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "arsenal_aura.settings")
 
 application = get_wsgi_application()
+
+from core.chat import keyword_index  # noqa: E402
+
+keyword_index.warm()
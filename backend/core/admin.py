@@ -7,8 +7,10 @@ from .models import (
     PreGeneratedLine,
     GeneratorHistory,
     FixturesCache,
+    Fixture,
     Prediction,
     UserStats,
+    LeaderboardEntry,
     KeywordResponse,
     ChatMessage,
     Honor,
@@ -54,6 +56,7 @@ class GeneratorHistoryAdmin(admin.ModelAdmin):
     list_display = ("user", "mode", "player", "created_at")
     list_filter = ("mode",)
     search_fields = ("output_text", "user__username")
+    show_full_result_count = False
 
 
 @admin.register(FixturesCache)
@@ -62,6 +65,13 @@ class FixturesCacheAdmin(admin.ModelAdmin):
     search_fields = ("cache_key", "match_id")
 
 
+@admin.register(Fixture)
+class FixtureAdmin(admin.ModelAdmin):
+    list_display = ("match_id", "kickoff", "home_team", "away_team", "status", "home_score", "away_score")
+    list_filter = ("status", "competition")
+    search_fields = ("match_id", "home_team", "away_team")
+
+
 @admin.register(Prediction)
 class PredictionAdmin(admin.ModelAdmin):
     list_display = ("user", "match_id", "opponent", "kickoff", "points")
@@ -74,6 +84,13 @@ class UserStatsAdmin(admin.ModelAdmin):
     list_display = ("user", "total_points", "streak", "accuracy")
 
 
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ("scope", "user", "rank", "total_points")
+    list_filter = ("scope",)
+    search_fields = ("user__username",)
+
+
 @admin.register(KeywordResponse)
 class KeywordResponseAdmin(admin.ModelAdmin):
     list_display = ("keyword", "response")
@@ -84,6 +101,7 @@ class KeywordResponseAdmin(admin.ModelAdmin):
 class ChatMessageAdmin(admin.ModelAdmin):
     list_display = ("user", "role", "created_at")
     search_fields = ("text", "user__username")
+    show_full_result_count = False
 
 
 @admin.register(Honor)
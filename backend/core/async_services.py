@@ -0,0 +1,128 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .schedule import finished_result, next_scheduled_match
+from .services import (
+    badge_cache_key,
+    describe_fixture,
+    fetch_next_match,
+    fetch_team_badge,
+    football_data_payload,
+    get_cached_value,
+    is_complete_match_payload,
+    known_arsenal_team_id,
+    sportsdb_payload,
+    stale_badge,
+    stale_next_match,
+    store_arsenal_team_id,
+    store_badge,
+    store_match_result,
+    store_next_match,
+)
+from .singleflight import async_flight, background_refresher
+from .upstream import async_football_data_client, async_sportsdb_client, CircuitOpenError, UpstreamError
+
+
+async def afetch_football_data(path, params=None):
+    if not settings.FOOTBALL_DATA_API_KEY:
+        return {"error": "Missing API key"}
+    try:
+        response = await async_football_data_client().get(path, params=params)
+    except CircuitOpenError:
+        return {"error": "Upstream unavailable"}
+    except UpstreamError:
+        return {"error": "Network error"}
+    return football_data_payload(response)
+
+
+async def afetch_sportsdb(path, params=None):
+    if not settings.SPORTS_DB_API_KEY:
+        return None
+    try:
+        response = await async_sportsdb_client().get(path, params=params)
+    except UpstreamError:
+        return None
+    return sportsdb_payload(response)
+
+
+async def aget_team_badge(team_name):
+    if not team_name:
+        return None
+    normalized, cache_key = badge_cache_key(team_name)
+    cached = await sync_to_async(get_cached_value)(cache_key)
+    if cached:
+        return cached.get("badge")
+    stale = await sync_to_async(stale_badge)(cache_key)
+    if stale:
+        background_refresher.submit(cache_key, lambda: fetch_team_badge(normalized, cache_key))
+        return stale
+    return await async_flight.do(cache_key, lambda: afetch_team_badge(normalized, cache_key))
+
+
+async def afetch_team_badge(normalized, cache_key):
+    data = await afetch_sportsdb("/searchteams.php", params={"t": normalized})
+    return await sync_to_async(store_badge)(cache_key, data)
+
+
+async def aget_arsenal_team_id():
+    team_id = await sync_to_async(known_arsenal_team_id)()
+    if team_id:
+        return team_id
+    data = await afetch_football_data("/competitions/PL/teams")
+    return await sync_to_async(store_arsenal_team_id)(data)
+
+
+async def aget_next_match():
+    scheduled = await sync_to_async(next_scheduled_match)()
+    if scheduled and not scheduled["stale"]:
+        return scheduled
+    match = await aget_upstream_next_match()
+    if match.get("error") and scheduled:
+        return scheduled
+    return match
+
+
+async def aget_upstream_next_match():
+    cache_key = "arsenal_next_match"
+    cached = await sync_to_async(get_cached_value)(cache_key)
+    if cached and is_complete_match_payload(cached):
+        return {**cached, "stale": False}
+    stale = await sync_to_async(stale_next_match)()
+    if stale:
+        background_refresher.submit(cache_key, fetch_next_match)
+        return stale
+    return await async_flight.do(cache_key, afetch_next_match)
+
+
+async def afetch_next_match():
+    team_id = await aget_arsenal_team_id()
+    if not team_id:
+        stale = await sync_to_async(stale_next_match)()
+        return stale or {"error": "Could not find Arsenal team id"}
+    data = await afetch_football_data(f"/teams/{team_id}/matches", params={"status": "SCHEDULED", "limit": 10})
+    return await sync_to_async(store_next_match)(data)
+
+
+async def anext_fixture():
+    fixture = describe_fixture(await aget_next_match())
+    if not fixture.get("unavailable"):
+        fixture["homeBadge"], fixture["awayBadge"] = await asyncio.gather(
+            aget_team_badge(fixture["homeTeam"]), aget_team_badge(fixture["awayTeam"])
+        )
+    return fixture
+
+
+async def aget_match_result(match_id):
+    stored = await sync_to_async(finished_result)(match_id)
+    if stored:
+        return stored
+    cache_key = f"match_result_{match_id}"
+    cached = await sync_to_async(get_cached_value)(cache_key)
+    if cached:
+        return cached
+    return await async_flight.do(cache_key, lambda: afetch_match_result(match_id))
+
+
+async def afetch_match_result(match_id):
+    data = await afetch_football_data(f"/matches/{match_id}")
+    return await sync_to_async(store_match_result)(match_id, data)
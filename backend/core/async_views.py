@@ -0,0 +1,62 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from .async_services import aget_match_result, anext_fixture
+from .services import settle_match
+from .views import NextFixtureView, PredictionCheckView, check_payload, start_check
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def authorize(view_class, method, request, *args, **kwargs):
+    view = view_class()
+    view.http_method_names = [method.lower()]
+    view.args = args
+    view.kwargs = kwargs
+    drf_request = view.initialize_request(request, *args, **kwargs)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+    try:
+        view.initial(drf_request, *args, **kwargs)
+        if request.method != method:
+            raise exceptions.MethodNotAllowed(request.method)
+    except Exception as exc:
+        response = view.finalize_response(drf_request, view.handle_exception(exc), *args, **kwargs)
+        return drf_request, response.render()
+    return drf_request, None
+
+
+def async_api_view(view_class, method):
+    def decorator(handler):
+        async def view(request, *args, **kwargs):
+            drf_request, denied = await sync_to_async(authorize)(view_class, method, request, *args, **kwargs)
+            if denied is not None:
+                return denied
+            return await handler(drf_request, *args, **kwargs)
+
+        view.csrf_exempt = True
+        return view
+
+    return decorator
+
+
+@async_api_view(NextFixtureView, "GET")
+async def next_fixture_view(request):
+    return json_response(await anext_fixture())
+
+
+@async_api_view(PredictionCheckView, "POST")
+async def prediction_check_view(request, pk):
+    prediction = await sync_to_async(start_check)(pk, request.user)
+    if not prediction:
+        return json_response({"detail": "Prediction not found."}, status=status.HTTP_404_NOT_FOUND)
+    if not prediction.checked_at:
+        match = await aget_match_result(prediction.match_id)
+        result = await sync_to_async(settle_match)(prediction.match_id, match)
+        if result.get("error"):
+            return json_response({"detail": result["error"]}, status=result["status"])
+        await sync_to_async(prediction.refresh_from_db)()
+    return json_response(check_payload(prediction))
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def stamp_profile(token, profile):
+    token["club"] = profile["favorite_club"]
+    token["banter"] = profile["banter_mode"]
+    return token
+
+
+def tokens_for_user(user, profile):
+    refresh = RefreshToken.for_user(user)
+    refresh["email"] = user.email
+    refresh["is_staff"] = user.is_staff
+    return stamp_profile(refresh, profile)
+
+
+class ClaimsUser(TokenUser):
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
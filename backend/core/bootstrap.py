@@ -0,0 +1,35 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=settings.BOOTSTRAP_WORKERS, thread_name_prefix="bootstrap")
+
+
+def _run(fn, args):
+    try:
+        return fn(*args)
+    finally:
+        close_old_connections()
+
+
+def gather(tasks, timeout):
+    futures = {name: executor.submit(_run, task[0], task[1:]) for name, task in tasks.items()}
+    deadline = time.monotonic() + timeout
+    results = {}
+    errors = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except TimeoutError:
+            results[name] = None
+            errors[name] = "Timed out."
+        except Exception:
+            logger.exception("Bootstrap section %s failed", name)
+            results[name] = None
+            errors[name] = "Unavailable."
+    return results, errors
@@ -0,0 +1,196 @@
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from .models import FixturesCache
+
+
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+STALE_FALLBACK_KEYS = ["arsenal_next_match", "pl_team_id_arsenal"]
+
+
+class DatabaseCacheBackend:
+    def get(self, cache_key, allow_expired=False):
+        qs = FixturesCache.objects.filter(cache_key=cache_key)
+        if not allow_expired:
+            qs = qs.filter(expires_at__gt=timezone.now())
+        return qs.values_list("payload", "expires_at").first()
+
+    def get_many(self, cache_keys, allow_expired=False):
+        qs = FixturesCache.objects.filter(cache_key__in=cache_keys)
+        if not allow_expired:
+            qs = qs.filter(expires_at__gt=timezone.now())
+        return {key: (payload, expires_at) for key, payload, expires_at in qs.values_list("cache_key", "payload", "expires_at")}
+
+    def set(self, cache_key, payload, expires_at, match_id=""):
+        FixturesCache.objects.bulk_create(
+            [
+                FixturesCache(
+                    cache_key=cache_key,
+                    match_id=match_id,
+                    payload=payload,
+                    fetched_at=timezone.now(),
+                    expires_at=expires_at,
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["cache_key"],
+            update_fields=["match_id", "payload", "fetched_at", "expires_at"],
+        )
+
+
+class DjangoCacheBackend:
+    def __init__(self, alias="default", prefix="fixtures:"):
+        self.alias = alias
+        self.prefix = prefix
+
+    def get(self, cache_key, allow_expired=False):
+        cached = caches[self.alias].get(self.prefix + cache_key)
+        if not cached:
+            return None
+        payload, expires_at = cached
+        if not allow_expired and expires_at <= timezone.now():
+            return None
+        return payload, expires_at
+
+    def get_many(self, cache_keys, allow_expired=False):
+        found = caches[self.alias].get_many([self.prefix + cache_key for cache_key in cache_keys])
+        now = timezone.now()
+        entries = {}
+        for key, (payload, expires_at) in found.items():
+            if allow_expired or expires_at > now:
+                entries[key[len(self.prefix):]] = (payload, expires_at)
+        return entries
+
+    def set(self, cache_key, payload, expires_at, match_id=""):
+        caches[self.alias].set(self.prefix + cache_key, (payload, expires_at), timeout=None)
+
+
+class TieredCache:
+    def __init__(self, backend, max_entries=256):
+        self.backend = backend
+        self.local = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self._counters = {"local_hits": 0, "local_misses": 0, "backend_hits": 0, "backend_misses": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "local_entries": len(self.local)}
+
+    def get_entry(self, cache_key, allow_expired=False):
+        entry = self.local.get(cache_key)
+        if entry is not None and (allow_expired or entry[1] > timezone.now()):
+            self._count("local_hits")
+            return entry
+        self._count("local_misses")
+        fresh = self.backend.get(cache_key, allow_expired=allow_expired)
+        if fresh is None:
+            self._count("backend_misses")
+            return entry if allow_expired else None
+        self._count("backend_hits")
+        self.local.set(cache_key, fresh)
+        return fresh
+
+    def get(self, cache_key, allow_expired=False):
+        entry = self.get_entry(cache_key, allow_expired=allow_expired)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def get_entries(self, cache_keys, allow_expired=False):
+        now = timezone.now()
+        entries = {}
+        missing = []
+        for cache_key in dict.fromkeys(cache_keys):
+            entry = self.local.get(cache_key)
+            if entry is not None and (allow_expired or entry[1] > now):
+                self._count("local_hits")
+                entries[cache_key] = entry
+            else:
+                self._count("local_misses")
+                missing.append(cache_key)
+        if not missing:
+            return entries
+        found = self.backend.get_many(missing, allow_expired=allow_expired)
+        for cache_key in missing:
+            fresh = found.get(cache_key)
+            if fresh is None:
+                self._count("backend_misses")
+                continue
+            self._count("backend_hits")
+            self.local.set(cache_key, fresh)
+            entries[cache_key] = fresh
+        return entries
+
+    def set(self, cache_key, payload, ttl_minutes, match_id=""):
+        expires_at = timezone.now() + timedelta(minutes=ttl_minutes)
+        self.backend.set(cache_key, payload, expires_at, match_id=match_id)
+        self.local.set(cache_key, (payload, expires_at))
+
+    def invalidate(self, cache_key=None):
+        if cache_key is None:
+            self.local.clear()
+        else:
+            self.local.delete(cache_key)
+
+
+def prune_expired_rows(retention_days, batch_size=500):
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    qs = FixturesCache.objects.filter(expires_at__lt=cutoff).exclude(cache_key__in=STALE_FALLBACK_KEYS)
+    deleted = 0
+    while True:
+        rows = list(qs.order_by("id").values_list("id", "cache_key")[:batch_size])
+        if not rows:
+            return deleted
+        FixturesCache.objects.filter(id__in=[row_id for row_id, _ in rows]).delete()
+        for _, cache_key in rows:
+            fixtures_cache.invalidate(cache_key)
+        deleted += len(rows)
+
+
+def build_fixtures_cache():
+    if settings.FIXTURES_CACHE_BACKEND == "django":
+        backend = DjangoCacheBackend(settings.FIXTURES_CACHE_ALIAS)
+    else:
+        backend = DatabaseCacheBackend()
+    return TieredCache(backend, max_entries=settings.FIXTURES_CACHE_LRU_SIZE)
+
+
+fixtures_cache = build_fixtures_cache()
@@ -0,0 +1,133 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from django.conf import settings
+from django.db import DatabaseError
+from .models import KeywordResponse
+
+
+DEFAULT_REPLY = "Arsenal is the best club."
+TOKEN_RE = re.compile(r"\w+(?:-\w+)*")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for index, pattern in enumerate(patterns):
+            self._add(pattern, index)
+        self._build()
+
+    def _add(self, pattern, index):
+        state = 0
+        for symbol in pattern:
+            next_state = self.goto[state].get(symbol)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][symbol] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(index)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and symbol not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(symbol, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, sequence):
+        found = Counter()
+        state = 0
+        for symbol in sequence:
+            while state and symbol not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(symbol, 0)
+            found.update(self.output[state])
+        return found
+
+
+class KeywordIndex:
+    def __init__(self, top_k=2):
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self._compiled = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._compiled = None
+            self._expires_at = 0.0
+
+    def build(self, rows):
+        entries = []
+        document_frequency = Counter()
+        for keyword, response in rows:
+            tokens = tuple(tokenize(keyword))
+            if not tokens:
+                continue
+            entries.append((tokens, response))
+            document_frequency.update(set(tokens))
+        total = len(entries)
+        weights = [
+            sum(math.log(1 + total / document_frequency[token]) for token in tokens) for tokens, _ in entries
+        ]
+        return entries, weights, AhoCorasick([tokens for tokens, _ in entries])
+
+    def compiled(self):
+        compiled = self._compiled
+        if compiled is not None and time.monotonic() < self._expires_at:
+            return compiled
+        with self._lock:
+            if self._compiled is None or time.monotonic() >= self._expires_at:
+                self._compiled = self.build(KeywordResponse.objects.order_by("id").values_list("keyword", "response"))
+                self._expires_at = time.monotonic() + settings.SAMPLER_TTL_SECONDS
+            return self._compiled
+
+    def warm(self):
+        try:
+            self.compiled()
+        except DatabaseError:
+            self.invalidate()
+
+    def search(self, message, top_k=None):
+        entries, weights, automaton = self.compiled()
+        counts = automaton.find(tokenize(message))
+        scored = sorted(
+            counts.items(),
+            key=lambda item: (-item[1] * weights[item[0]], -len(entries[item[0]][0]), item[0]),
+        )
+        results = []
+        seen = set()
+        for index, count in scored:
+            response = entries[index][1]
+            if response in seen:
+                continue
+            seen.add(response)
+            results.append((" ".join(entries[index][0]), response, round(count * weights[index], 4)))
+            if len(results) == (top_k or self.top_k):
+                break
+        return results
+
+    def reply(self, message):
+        results = self.search(message)
+        if not results:
+            return DEFAULT_REPLY
+        return " ".join(response for _, response, _ in results)
+
+
+keyword_index = KeywordIndex(top_k=settings.CHAT_TOP_K)
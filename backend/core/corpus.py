@@ -0,0 +1,198 @@
+import hashlib
+import random
+import time
+from itertools import islice
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from .models import ContentVersion, Fragment, Player, PreGeneratedLine
+from .sampling import line_sampler
+
+
+INTENSITY_SLOTS = {
+    "low": ("opener", "praise", "closer"),
+    "medium": ("opener", "praise", "tactical", "closer"),
+    "high": ("opener", "praise", "tactical", "nostalgia", "closer"),
+}
+MASK_64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    def __init__(self, size, seed, rounds=4):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(64) for _ in range(rounds)]
+
+    def _round(self, value, key):
+        value = ((value ^ key) * 0x9E3779B97F4A7C15) & MASK_64
+        value ^= value >> 29
+        return value & self.mask
+
+    def _encrypt(self, value):
+        left, right = value >> self.half, value & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+def mixed_radix(index, radices):
+    digits = []
+    for radix in radices:
+        index, digit = divmod(index, radix)
+        digits.append(digit)
+    return digits
+
+
+def format_line(intensity, name, parts):
+    if intensity == "low":
+        opener, praise, closer = parts
+        return f"{opener} {name} {praise}. {closer}"
+    if intensity == "medium":
+        opener, praise, tactical, closer = parts
+        return f"{opener} {name} {praise}. {tactical} {closer}"
+    opener, praise, tactical, nostalgia, closer = parts
+    return f"{opener} {name} {praise}. {tactical} {nostalgia} {closer}"
+
+
+def load_fragments():
+    fragments = {}
+    for category, text in Fragment.objects.order_by("id").values_list("category", "text"):
+        fragments.setdefault(category, []).append(text)
+    return fragments
+
+
+def combination_space(fragments, intensity):
+    size = 1
+    for category in INTENSITY_SLOTS[intensity]:
+        size *= len(fragments.get(category, []))
+    return size
+
+
+def iter_lines(fragments, intensity, player, start=0, seed=0):
+    pools = [fragments.get(category, []) for category in INTENSITY_SLOTS[intensity]]
+    size = combination_space(fragments, intensity)
+    if not size:
+        return
+    permutation = FeistelPermutation(size, f"{seed}:{intensity}:{player.id if player else 0}")
+    name = player.name if player else "Arsenal"
+    radices = [len(pool) for pool in pools]
+    for index in range(start, size):
+        digits = mixed_radix(permutation[index], radices)
+        parts = [pool[digit] for pool, digit in zip(pools, digits)]
+        yield index, PreGeneratedLine(text=format_line(intensity, name, parts), intensity=intensity, player=player)
+
+
+def existing_counts():
+    rows = PreGeneratedLine.objects.values_list("intensity", "player_id").annotate(total=Count("id")).order_by()
+    return {(intensity, player_id): total for intensity, player_id, total in rows}
+
+
+def corpus_stamp(fragments, seed):
+    digest = hashlib.blake2b(str(seed).encode("utf-8"), digest_size=12)
+    for category in sorted(fragments):
+        digest.update(f"\x1e{category}".encode("utf-8"))
+        for text in fragments[category]:
+            digest.update(f"\x1f{text}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cursor_key(intensity, player):
+    return f"corpus:{intensity}:{player.id if player else 0}"
+
+
+def load_cursor(key, stamp):
+    saved = ContentVersion.objects.filter(key=key).values_list("digest", flat=True).first() or ""
+    saved_stamp, _, cursor = saved.partition(":")
+    if saved_stamp != stamp or not cursor.isdigit():
+        return None
+    return int(cursor)
+
+
+def save_cursor(key, stamp, cursor):
+    ContentVersion.objects.update_or_create(key=key, defaults={"digest": f"{stamp}:{cursor}"})
+
+
+def reset_cursors(intensities=None, players=None):
+    cursors = ContentVersion.objects.filter(key__startswith="corpus:")
+    if intensities is not None and players is not None:
+        cursors = cursors.filter(key__in=[cursor_key(i, p) for i in intensities for p in players])
+    elif intensities is not None:
+        prefixes = Q()
+        for intensity in intensities:
+            prefixes |= Q(key__startswith=f"corpus:{intensity}:")
+        cursors = cursors.filter(prefixes)
+    return cursors.delete()[0]
+
+
+def fill_slice(fragments, intensity, player, wanted, stamp, seed=0, batch_size=2000):
+    if wanted <= 0:
+        return 0
+    key = cursor_key(intensity, player)
+    start = load_cursor(key, stamp)
+    existing = set()
+    if start is None:
+        start = 0
+        existing = set(
+            PreGeneratedLine.objects.filter(intensity=intensity, player=player).values_list("text", flat=True).iterator()
+        )
+    cursor = [start]
+
+    def candidates():
+        for index, line in iter_lines(fragments, intensity, player, start, seed=seed):
+            cursor[0] = index + 1
+            if line.text not in existing:
+                yield line
+
+    lines = islice(candidates(), wanted)
+    written = 0
+    while True:
+        batch = list(islice(lines, batch_size))
+        with transaction.atomic():
+            PreGeneratedLine.objects.bulk_create(batch, batch_size=batch_size)
+            save_cursor(key, stamp, cursor[0])
+        if not batch:
+            return written
+        written += len(batch)
+
+
+def delete_lines(lines, batch_size=2000):
+    table = connection.ops.quote_name(PreGeneratedLine._meta.db_table)
+    deleted = 0
+    last_id = 0
+    while True:
+        ids = list(lines.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+            deleted += cursor.rowcount
+        last_id = ids[-1]
+    line_sampler.invalidate()
+    return deleted
+
+
+def generate_corpus(per_player, intensities=None, players=None, seed=0, batch_size=2000, fragments=None):
+    fragments = fragments if fragments is not None else load_fragments()
+    players = list(players if players is not None else Player.objects.order_by("id")) or [None]
+    counts = existing_counts()
+    stamp = corpus_stamp(fragments, seed)
+    report = {}
+    for intensity in intensities or list(INTENSITY_SLOTS):
+        started = time.monotonic()
+        written = 0
+        for player in players:
+            wanted = per_player - counts.get((intensity, player.id if player else None), 0)
+            written += fill_slice(fragments, intensity, player, wanted, stamp, seed=seed, batch_size=batch_size)
+        report[intensity] = (written, time.monotonic() - started)
+    return report
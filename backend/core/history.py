@@ -0,0 +1,66 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict, deque
+from django.conf import settings
+from .models import GeneratorHistory
+
+
+def output_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+class RecentOutputs:
+    def __init__(self, size, max_users):
+        self.size = size
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    def _load(self, user_id):
+        texts = GeneratorHistory.objects.filter(user_id=user_id).order_by("-created_at").values_list(
+            "output_text", flat=True
+        )[: self.size]
+        ring = deque((output_digest(text) for text in reversed(list(texts))), maxlen=self.size)
+        return ring, Counter(ring)
+
+    def _entry(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None:
+                self._users.move_to_end(user_id)
+                return entry
+        entry = self._load(user_id)
+        with self._lock:
+            entry = self._users.setdefault(user_id, entry)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return entry
+
+    def seen(self, user_id):
+        _, counts = self._entry(user_id)
+        with self._lock:
+            return set(counts)
+
+    def record(self, user_id, texts):
+        ring, counts = self._entry(user_id)
+        with self._lock:
+            for text in texts:
+                if len(ring) == ring.maxlen:
+                    evicted = ring[0]
+                    counts[evicted] -= 1
+                    if counts[evicted] <= 0:
+                        del counts[evicted]
+                digest = output_digest(text)
+                ring.append(digest)
+                counts[digest] += 1
+
+    def forget(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+
+recent_outputs = RecentOutputs(settings.HISTORY_DEDUPE_SIZE, settings.HISTORY_CACHE_USERS)
@@ -0,0 +1,212 @@
+import zlib
+from datetime import date
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from .models import LeaderboardEntry, Prediction, Profile
+
+
+GLOBAL_SCOPE = "global"
+
+RANK_SQL = """
+UPDATE {table} SET position = ranked.position, rank = ranked.rank
+FROM (
+    SELECT id,
+        ROW_NUMBER() OVER (ORDER BY total_points DESC, correct_predictions DESC, user_id) AS position,
+        RANK() OVER (ORDER BY total_points DESC) AS rank
+    FROM {table}
+    WHERE scope = %s
+) AS ranked
+WHERE {table}.id = ranked.id AND ({table}.position <> ranked.position OR {table}.rank <> ranked.rank)
+"""
+
+
+def club_scope(club):
+    return f"club:{club}"
+
+
+def season_label(when):
+    year = when.year if when.month >= 7 else when.year - 1
+    return f"{year}-{str(year + 1)[2:]}"
+
+
+def season_scope(season):
+    return f"season:{season}"
+
+
+def current_season():
+    return season_label(timezone.now())
+
+
+def rerank(scope):
+    table = connection.ops.quote_name(LeaderboardEntry._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(RANK_SQL.format(table=table), [scope])
+
+
+def lock_scopes(scopes):
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for scope in sorted(scopes):
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [zlib.crc32(f"leaderboard:{scope}".encode("utf-8"))])
+
+
+def ahead_of(scope, total_points, correct_predictions, user_id):
+    return LeaderboardEntry.objects.filter(scope=scope).exclude(user_id=user_id).filter(
+        Q(total_points__gt=total_points)
+        | Q(total_points=total_points, correct_predictions__gt=correct_predictions)
+        | Q(total_points=total_points, correct_predictions=correct_predictions, user_id__lt=user_id)
+    )
+
+
+def place_entry(scope, user_id, total_points, correct_predictions, total_predictions):
+    scoped = LeaderboardEntry.objects.filter(scope=scope)
+    entry = scoped.filter(user_id=user_id).first()
+    position = ahead_of(scope, total_points, correct_predictions, user_id).count() + 1
+    if entry is None:
+        scoped.filter(position__gte=position).update(position=F("position") + 1)
+        scoped.filter(total_points__lt=total_points).update(rank=F("rank") + 1)
+    else:
+        others = scoped.exclude(user_id=user_id)
+        if position < entry.position:
+            others.filter(position__gte=position, position__lt=entry.position).update(position=F("position") + 1)
+        elif position > entry.position:
+            others.filter(position__gt=entry.position, position__lte=position).update(position=F("position") - 1)
+        if total_points > entry.total_points:
+            others.filter(total_points__gte=entry.total_points, total_points__lt=total_points).update(rank=F("rank") + 1)
+        elif total_points < entry.total_points:
+            others.filter(total_points__gte=total_points, total_points__lt=entry.total_points).update(rank=F("rank") - 1)
+    LeaderboardEntry.objects.update_or_create(
+        scope=scope,
+        user_id=user_id,
+        defaults={
+            "total_points": total_points,
+            "correct_predictions": correct_predictions,
+            "total_predictions": total_predictions,
+            "position": position,
+            "rank": scoped.filter(total_points__gt=total_points).count() + 1,
+        },
+    )
+
+
+def remove_entry(scope, user_id):
+    entry = LeaderboardEntry.objects.filter(scope=scope, user_id=user_id).first()
+    if not entry:
+        return
+    entry.delete()
+    scoped = LeaderboardEntry.objects.filter(scope=scope)
+    scoped.filter(position__gt=entry.position).update(position=F("position") - 1)
+    scoped.filter(total_points__lt=entry.total_points).update(rank=F("rank") - 1)
+
+
+def add_results(scope, results):
+    known = set(
+        LeaderboardEntry.objects.filter(scope=scope, user_id__in=[user_id for user_id, _ in results]).values_list(
+            "user_id", flat=True
+        )
+    )
+    missed = [user_id for user_id, points in results if not points and user_id in known]
+    if missed:
+        LeaderboardEntry.objects.filter(scope=scope, user_id__in=missed).update(
+            total_predictions=F("total_predictions") + 1, updated_at=timezone.now()
+        )
+    for user_id, points in sorted(results):
+        if not points and user_id in known:
+            continue
+        totals = (
+            LeaderboardEntry.objects.filter(scope=scope, user_id=user_id)
+            .values_list("total_points", "correct_predictions", "total_predictions")
+            .first()
+        ) or (0, 0, 0)
+        place_entry(scope, user_id, totals[0] + points, totals[1] + (1 if points > 0 else 0), totals[2] + 1)
+
+
+def apply_settlement(predictions):
+    if not predictions:
+        return
+    clubs = dict(
+        Profile.objects.filter(user_id__in={p.user_id for p in predictions}).values_list("user_id", "favorite_club")
+    )
+    results_by_scope = {}
+    for prediction in predictions:
+        result = (prediction.user_id, prediction.points)
+        scopes = [GLOBAL_SCOPE, season_scope(season_label(prediction.kickoff))]
+        if clubs.get(prediction.user_id):
+            scopes.append(club_scope(clubs[prediction.user_id]))
+        for scope in scopes:
+            results_by_scope.setdefault(scope, []).append(result)
+    with transaction.atomic():
+        lock_scopes(results_by_scope)
+        for scope in sorted(results_by_scope):
+            add_results(scope, results_by_scope[scope])
+
+
+def move_club(user_id, old_club, new_club):
+    if old_club == new_club:
+        return
+    with transaction.atomic():
+        lock_scopes([club_scope(old_club), club_scope(new_club)])
+        remove_entry(club_scope(old_club), user_id)
+        totals = LeaderboardEntry.objects.filter(scope=GLOBAL_SCOPE, user_id=user_id).first()
+        if not totals:
+            return
+        place_entry(
+            club_scope(new_club),
+            user_id,
+            totals.total_points,
+            totals.correct_predictions,
+            totals.total_predictions,
+        )
+
+
+def rebuild():
+    clubs = dict(Profile.objects.values_list("user_id", "favorite_club"))
+    totals = {}
+    rows = (
+        Prediction.objects.filter(checked_at__isnull=False)
+        .values("user_id", "kickoff__year", "kickoff__month")
+        .annotate(points_sum=Sum("points"), correct=Count("id", filter=Q(points__gt=0)), total=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        season = season_label(date(row["kickoff__year"], row["kickoff__month"], 1))
+        scopes = [GLOBAL_SCOPE, season_scope(season)]
+        if clubs.get(row["user_id"]):
+            scopes.append(club_scope(clubs[row["user_id"]]))
+        for scope in scopes:
+            entry = totals.setdefault((scope, row["user_id"]), [0, 0, 0])
+            entry[0] += row["points_sum"]
+            entry[1] += row["correct"]
+            entry[2] += row["total"]
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(
+            [
+                LeaderboardEntry(
+                    scope=scope,
+                    user_id=user_id,
+                    total_points=points,
+                    correct_predictions=correct,
+                    total_predictions=total,
+                )
+                for (scope, user_id), (points, correct, total) in totals.items()
+            ],
+            batch_size=1000,
+        )
+        for scope in {scope for scope, _ in totals}:
+            rerank(scope)
+    return len(totals)
+
+
+def get_page(scope, page, page_size):
+    start = (page - 1) * page_size
+    entries = list(
+        LeaderboardEntry.objects.filter(scope=scope, position__gt=start, position__lte=start + page_size + 1)
+        .order_by("position")
+    )
+    return entries[:page_size], len(entries) > page_size
+
+
+def get_entry(scope, user_id):
+    return LeaderboardEntry.objects.filter(scope=scope, user_id=user_id).first()
@@ -0,0 +1,58 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from core.authentication import tokens_for_user
+from core.profiles import DEFAULT_PROFILE, profile_cache
+from core.views import HonorsView, InfoLinksView, ModesView, PlayersView, TimelineView
+
+
+ENDPOINTS = [
+    ("/api/players", PlayersView),
+    ("/api/modes", ModesView),
+    ("/api/info/honors", HonorsView),
+    ("/api/info/timeline", TimelineView),
+    ("/api/info/links", InfoLinksView),
+]
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--email")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options["email"]:
+            users = users.filter(email=options["email"].lower())
+        user = users.order_by("id").first()
+        if not user:
+            raise CommandError("No active user to benchmark with")
+        access = str(tokens_for_user(user, profile_cache.get(user.id) or DEFAULT_PROFILE).access_token)
+        factory = APIRequestFactory()
+        count = options["requests"]
+
+        def run(view, path):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                for _ in range(count):
+                    response = view(factory.get(path, HTTP_AUTHORIZATION=f"Bearer {access}"))
+                    if response.status_code != 200:
+                        raise CommandError(f"{path} returned {response.status_code}")
+                elapsed = time.perf_counter() - started
+            return len(captured.captured_queries) / count, elapsed / count * 1e6
+
+        for path, view_class in ENDPOINTS:
+            full = view_class.as_view(authentication_classes=[JWTAuthentication], throttle_classes=[])
+            stateless = view_class.as_view(throttle_classes=[])
+            run(stateless, path)
+            full_queries, full_us = run(full, path)
+            stateless_queries, stateless_us = run(stateless, path)
+            self.stdout.write(
+                f"{path}: ORM user {full_queries:.1f} queries, {full_us:.0f} us/request; "
+                f"token user {stateless_queries:.1f} queries, {stateless_us:.0f} us/request"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
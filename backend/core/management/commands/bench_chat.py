@@ -0,0 +1,58 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from core.chat import DEFAULT_REPLY, keyword_index
+from core.models import KeywordResponse
+
+
+def legacy_reply(items, message):
+    message = message.lower()
+    matches = [item for item in items if item.keyword.lower() in message]
+    if not matches:
+        return DEFAULT_REPLY
+    best = sorted(matches, key=lambda x: len(x.keyword), reverse=True)[:2]
+    return " ".join(b.response for b in best)
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        keywords = list(KeywordResponse.objects.values_list("keyword", flat=True))
+        filler = ["what", "about", "the", "price", "of", "nicole", "tickets", "tonight", "is", "back", "again"]
+        messages = [
+            " ".join(rng.choice(keywords + filler * 3) for _ in range(rng.randint(3, 14)))
+            for _ in range(options["messages"])
+        ]
+
+        started = time.perf_counter()
+        for message in messages:
+            items = list(KeywordResponse.objects.all())
+            legacy_reply(items, message)
+        legacy_db = time.perf_counter() - started
+
+        items = list(KeywordResponse.objects.all())
+        started = time.perf_counter()
+        for message in messages:
+            legacy_reply(items, message)
+        legacy_scan = time.perf_counter() - started
+
+        keyword_index.invalidate()
+        started = time.perf_counter()
+        keyword_index.compiled()
+        build = time.perf_counter() - started
+        started = time.perf_counter()
+        for message in messages:
+            keyword_index.reply(message)
+        indexed = time.perf_counter() - started
+
+        count = len(messages)
+        self.stdout.write(f"{len(keywords)} keywords, {count} messages")
+        self.stdout.write(f"legacy loop with query: {legacy_db / count * 1e6:.1f} us/message")
+        self.stdout.write(f"legacy loop, rows preloaded: {legacy_scan / count * 1e6:.1f} us/message")
+        self.stdout.write(f"index build: {build * 1e3:.2f} ms")
+        self.stdout.write(f"indexed search: {indexed / count * 1e6:.1f} us/message")
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from core.corpus import INTENSITY_SLOTS, delete_lines, generate_corpus, reset_cursors
+from core.models import Player, PreGeneratedLine
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--per-player", type=int, default=1000)
+        parser.add_argument("--intensity", action="append", choices=list(INTENSITY_SLOTS))
+        parser.add_argument("--player", action="append")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--replace", action="store_true")
+
+    def handle(self, *args, **options):
+        intensities = options["intensity"] or list(INTENSITY_SLOTS)
+        players = Player.objects.order_by("id")
+        if options["player"]:
+            players = players.filter(name__in=options["player"])
+        players = list(players)
+        if options["replace"]:
+            lines = PreGeneratedLine.objects.filter(intensity__in=intensities)
+            if options["player"]:
+                lines = lines.filter(player__in=players)
+            deleted = delete_lines(lines, batch_size=options["batch_size"])
+            reset_cursors(intensities, players if options["player"] else None)
+            self.stdout.write(f"Deleted {deleted} existing lines")
+        report = generate_corpus(
+            options["per_player"],
+            intensities=intensities,
+            players=players,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        total = 0
+        elapsed = 0.0
+        for intensity, (written, seconds) in report.items():
+            total += written
+            elapsed += seconds
+            self.stdout.write(f"{intensity}: {written} rows in {seconds:.1f}s ({written / max(seconds, 1e-6):.0f} rows/s)")
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {total} lines in {elapsed:.1f}s ({total / max(elapsed, 1e-6):.0f} rows/s)")
+        )
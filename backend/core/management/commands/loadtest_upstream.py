@@ -0,0 +1,162 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from core.authentication import tokens_for_user
+from core.cache import DjangoCacheBackend, fixtures_cache
+from core.profiles import DEFAULT_PROFILE, profile_cache
+from core.upstream import aclose_clients
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        path = self.path.split("?")[0]
+        if path.endswith("/matches") and path.startswith("/teams/"):
+            payload = {
+                "matches": [
+                    {
+                        "id": 9001,
+                        "utcDate": "2030-08-17T14:00:00Z",
+                        "competition": {"name": "Premier League"},
+                        "homeTeam": {"name": "Arsenal FC"},
+                        "awayTeam": {"name": "Chelsea FC"},
+                        "status": "SCHEDULED",
+                    }
+                ]
+            }
+        elif path.startswith("/matches/"):
+            match_id = path.rsplit("/", 1)[-1]
+            payload = {"match": {"id": match_id, "status": "FINISHED", "score": {"fullTime": {"home": 2, "away": 1}}}}
+        elif path.endswith("/searchteams.php"):
+            payload = {"teams": [{"strTeamBadge": "https://example.invalid/badge.png"}]}
+        else:
+            payload = {}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def summarize(samples):
+    latencies = sorted(seconds * 1000 for _, seconds in samples)
+    statuses = sorted({code for code, _ in samples})
+    return f"p50 {statistics.median(latencies):.0f} ms, max {latencies[-1]:.0f} ms, statuses {statuses}"
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--delay", type=float, default=2.0)
+        parser.add_argument("--slow", type=int, default=10)
+        parser.add_argument("--fast", type=int, default=20)
+        parser.add_argument("--slow-path", default="/api/fixtures/next")
+        parser.add_argument("--fast-path", default="/api/modes")
+        parser.add_argument("--server", choices=["asgi", "wsgi"], default="asgi")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        if not user:
+            raise CommandError("No active user to run the load test with")
+        access = str(tokens_for_user(user, profile_cache.get(user.id) or DEFAULT_PROFILE).access_token)
+
+        StubUpstream.delay = options["delay"]
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstream)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        upstream = f"http://127.0.0.1:{server.server_address[1]}"
+
+        backend = fixtures_cache.backend
+        fixtures_cache.backend = DjangoCacheBackend(prefix="loadtest:")
+        fixtures_cache.invalidate()
+        try:
+            with override_settings(
+                FOOTBALL_DATA_BASE_URL=upstream,
+                SPORTS_DB_BASE_URL=upstream,
+                FOOTBALL_DATA_API_KEY=settings.FOOTBALL_DATA_API_KEY or "stub",
+                SPORTS_DB_API_KEY=settings.SPORTS_DB_API_KEY or "stub",
+                ARSENAL_TEAM_ID="57",
+                FIXTURE_SCHEDULE_ENABLED=False,
+            ):
+                started = time.perf_counter()
+                slow, fast = asyncio.run(self.load(access, options))
+                elapsed = time.perf_counter() - started
+        finally:
+            fixtures_cache.backend = backend
+            fixtures_cache.invalidate()
+            server.shutdown()
+
+        if options["server"] == "wsgi":
+            mode = "wsgi, one sync worker"
+        else:
+            mode = f"asgi, {'async' if settings.ASYNC_VIEWS else 'sync'} upstream views"
+        self.stdout.write(f"{mode}, upstream delay {options['delay']:.1f}s, wall time {elapsed:.1f}s")
+        self.stdout.write(f"{options['slow_path']} x{len(slow)}: {summarize(slow)}")
+        self.stdout.write(f"{options['fast_path']} x{len(fast)}: {summarize(fast)}")
+        self.stdout.write(self.style.SUCCESS("Load test complete"))
+
+    async def load(self, access, options):
+        headers = {"Authorization": f"Bearer {access}"}
+        if options["server"] == "wsgi":
+            worker = ThreadPoolExecutor(max_workers=1)
+            client = httpx.Client(
+                transport=httpx.WSGITransport(app=get_wsgi_application()),
+                base_url="http://localhost",
+                headers=headers,
+                timeout=None,
+            )
+
+            def send(path):
+                return client.get(path).status_code
+
+            async def request(path):
+                return await asyncio.get_running_loop().run_in_executor(worker, send, path)
+
+        else:
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=get_asgi_application()),
+                base_url="http://localhost",
+                headers=headers,
+                timeout=None,
+            )
+
+            async def request(path):
+                return (await client.get(path)).status_code
+
+        async def timed(path):
+            started = time.perf_counter()
+            code = await request(path)
+            return code, time.perf_counter() - started
+
+        try:
+            slow = [asyncio.create_task(timed(options["slow_path"])) for _ in range(options["slow"])]
+            await asyncio.sleep(min(0.2, options["delay"] / 4))
+            fast = []
+            for _ in range(options["fast"]):
+                fast.append(await timed(options["fast_path"]))
+                await asyncio.sleep(options["delay"] / max(options["fast"], 1))
+            slow = await asyncio.gather(*slow)
+        finally:
+            if options["server"] == "wsgi":
+                client.close()
+                worker.shutdown()
+            else:
+                await client.aclose()
+            await aclose_clients()
+        return slow, fast
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from core.models import FAVORITE_CLUB_CHOICES
+from core.services import get_team_badges
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true")
+
+    def handle(self, *args, **options):
+        clubs = [name for name, _ in FAVORITE_CLUB_CHOICES]
+        badges = get_team_badges(clubs, force=options["force"])
+        missing = [name for name in clubs if not badges.get(name)]
+        if missing:
+            self.stderr.write(f"No badge for {', '.join(missing)}")
+        self.stdout.write(self.style.SUCCESS(f"Prewarmed {len(clubs) - len(missing)} of {len(clubs)} badges"))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.models import ChatMessage, GeneratorHistory
+from core.retention import JsonlArchive, Pruner
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-per-user", type=int, default=settings.HISTORY_RETENTION_PER_USER)
+        parser.add_argument("--days", type=int, default=settings.HISTORY_RETENTION_DAYS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.1)
+        parser.add_argument("--archive")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        keep = options["keep_per_user"]
+        if keep:
+            keep = max(keep, settings.HISTORY_DEDUPE_SIZE)
+        archive = JsonlArchive(options["archive"]) if options["archive"] else None
+        pruner = Pruner(options["batch_size"], options["sleep"], archive=archive, dry_run=options["dry_run"])
+        try:
+            for model in (GeneratorHistory, ChatMessage):
+                deleted = pruner.prune(model, keep=keep, days=options["days"])
+                verb = "Would prune" if options["dry_run"] else "Pruned"
+                self.stdout.write(f"{verb} {deleted} {model.__name__} rows")
+        finally:
+            if archive:
+                archive.close()
+        self.stdout.write(self.style.SUCCESS("History retention complete"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from core import leaderboard
+from core.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--if-empty", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and LeaderboardEntry.objects.exists():
+            self.stdout.write("Leaderboard already built")
+            return
+        count = leaderboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Leaderboard rebuilt with {count} entries"))
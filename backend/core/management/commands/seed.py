@@ -1,7 +1,13 @@
-import random
+import hashlib
+import json
+import math
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from core.corpus import INTENSITY_SLOTS, delete_lines, generate_corpus, reset_cursors
 from core.models import (
+    ContentVersion,
     Player,
     Fact,
     Fragment,
@@ -14,23 +20,35 @@ from core.models import (
 )
 
 
+EMOJI_CHARS = ["🔴", "⚪", "🔥", "💫", "🎯", "🧠", "⚡", "🛡️", "🚀", "🏟️", "🌟", "👑", "💥", "🧩", "🔝", "🫶", "🏆"]
+
+
+def create_missing(model, field, values):
+    existing = set(model.objects.values_list(field, flat=True))
+    missing = [model(**{field: value}) for value in dict.fromkeys(values) if value not in existing]
+    model.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+
+
+def add_player_keywords(keywords, names):
+    for name in names:
+        keywords[name.lower()] = f"{name} brings Arsenal quality every time."
+        last = name.split()[-1].lower()
+        if last not in keywords:
+            keywords[last] = f"{name} is pure class in red and white."
+
+
+def content_digest(content):
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--reset", action="store_true")
+        parser.add_argument("--force", action="store_true")
 
     def handle(self, *args, **options):
-        if options["reset"]:
-            Player.objects.all().delete()
-            Fact.objects.all().delete()
-            Fragment.objects.all().delete()
-            PreGeneratedLine.objects.all().delete()
-            KeywordResponse.objects.all().delete()
-            Honor.objects.all().delete()
-            TimelineItem.objects.all().delete()
-            InfoLink.objects.all().delete()
-
-        for user in User.objects.all():
-            UserStats.objects.get_or_create(user=user)
+        missing_stats = User.objects.filter(userstats__isnull=True).values_list("id", flat=True)
+        UserStats.objects.bulk_create([UserStats(user_id=user_id) for user_id in missing_stats], ignore_conflicts=True)
 
         player_names = [
             "Bukayo Saka",
@@ -89,8 +107,6 @@ class Command(BaseCommand):
             "Nicolas Anelka",
             "Edu Gaspar",
         ]
-        for name in player_names:
-            Player.objects.get_or_create(name=name)
 
         fact_prefixes = [
             "Fact:",
@@ -135,8 +151,6 @@ class Command(BaseCommand):
         for prefix in fact_prefixes:
             for body in fact_bodies:
                 facts.append(f"{prefix} {body}")
-        for text in set(facts):
-            Fact.objects.get_or_create(text=text)
 
         openers = [
             "No debate:",
@@ -358,58 +372,6 @@ class Command(BaseCommand):
             "Top shelf only.",
         ]
 
-        def ensure_fragment(category, text, weight):
-            if not Fragment.objects.filter(category=category, text=text).exists():
-                Fragment.objects.create(category=category, text=text, weight=weight)
-
-        for text in openers:
-            ensure_fragment("opener", text, 2)
-        for text in praise_fragments:
-            ensure_fragment("praise", text, 1)
-        for text in tactical_fragments:
-            ensure_fragment("tactical", text, 1)
-        for text in nostalgia_fragments:
-            ensure_fragment("nostalgia", text, 2)
-        for text in closers:
-            ensure_fragment("closer", text, 2)
-        Fragment.objects.filter(category="emoji").delete()
-
-        if PreGeneratedLine.objects.count() < 10000:
-            openers_list = list(Fragment.objects.filter(category="opener").values_list("text", flat=True))
-            praise_list = list(Fragment.objects.filter(category="praise").values_list("text", flat=True))
-            tactical_list = list(Fragment.objects.filter(category="tactical").values_list("text", flat=True))
-            nostalgia_list = list(Fragment.objects.filter(category="nostalgia").values_list("text", flat=True))
-            closers_list = list(Fragment.objects.filter(category="closer").values_list("text", flat=True))
-            players = list(Player.objects.all())
-            lines = []
-            for _ in range(10000):
-                intensity = random.choice(["low", "medium", "high"])
-                player = random.choice(players) if players else None
-                name = player.name if player else "Arsenal"
-                opener = random.choice(openers_list)
-                praise = random.choice(praise_list)
-                tactical = random.choice(tactical_list)
-                nostalgia = random.choice(nostalgia_list)
-                closer = random.choice(closers_list)
-                if intensity == "low":
-                    text = f"{opener} {name} {praise}. {closer}"
-                elif intensity == "medium":
-                    text = f"{opener} {name} {praise}. {tactical} {closer}"
-                else:
-                    text = f"{opener} {name} {praise}. {tactical} {nostalgia} {closer}"
-                lines.append(PreGeneratedLine(text=text, intensity=intensity, player=player))
-            PreGeneratedLine.objects.bulk_create(lines, batch_size=500)
-
-        emoji_chars = ["🔴", "⚪", "🔥", "💫", "🎯", "🧠", "⚡", "🛡️", "🚀", "🏟️", "🌟", "👑", "💥", "🧩", "🔝", "🫶", "🏆"]
-        for line in PreGeneratedLine.objects.all():
-            cleaned = line.text
-            for ch in emoji_chars:
-                cleaned = cleaned.replace(ch, "")
-            cleaned = " ".join(cleaned.split())
-            if cleaned != line.text:
-                line.text = cleaned
-                line.save(update_fields=["text"])
-
         keywords = {
             "invincibles": "The Invincibles went unbeaten in the 2003/04 league season.",
             "wenger": "Arsene Wenger changed English football with style and belief.",
@@ -437,43 +399,124 @@ class Command(BaseCommand):
             "classic": "Classic Arsenal style never fades.",
         }
 
-        for player in Player.objects.all():
-            keywords[player.name.lower()] = f"{player.name} brings Arsenal quality every time."
-            last = player.name.split()[-1].lower()
-            if last not in keywords:
-                keywords[last] = f"{player.name} is pure class in red and white."
+        honors = [
+            ("League Titles", "13x", "Top-flight Champions"),
+            ("FA Cup Trophies", "14x", "Record Winners"),
+            ("The Invincibles", "2003/04", "Unbeaten League Season"),
+        ]
+        timeline = [
+            ("Woolwich Origins", "1886", "Founded in Woolwich and built from humble roots."),
+            ("Highbury Era", "1913–2006", "A historic home that shaped the club's identity."),
+            ("Emirates Stadium", "2006–Present", "Modern home with elite ambitions."),
+            ("Wenger Era", "1996–2018", "Style, trophies, and a global football legacy."),
+            ("Arteta Era", "2019–Present", "Control, youth, and a new Arsenal standard."),
+        ]
+        links = [
+            ("Arsenal Official Website", "https://www.arsenal.com/"),
+            ("Arsenal on BBC Sport", "https://www.bbc.com/sport/football/teams/arsenal"),
+            ("Arsenal on Sky Sports", "https://www.skysports.com/arsenal"),
+            ("Arsenal Fixtures and Results", "https://www.premierleague.com/clubs/1/Arsenal/fixtures"),
+        ]
 
-        for key, response in keywords.items():
-            KeywordResponse.objects.get_or_create(keyword=key, defaults={"response": response})
+        fragments = [("opener", text, 2) for text in openers]
+        fragments += [("praise", text, 1) for text in sorted(praise_fragments)]
+        fragments += [("tactical", text, 1) for text in sorted(tactical_fragments)]
+        fragments += [("nostalgia", text, 2) for text in nostalgia_fragments]
+        fragments += [("closer", text, 2) for text in closers]
 
-        if Honor.objects.count() == 0:
-            Honor.objects.bulk_create(
-                [
-                    Honor(title="League Titles", count="13x", subtitle="Top-flight Champions"),
-                    Honor(title="FA Cup Trophies", count="14x", subtitle="Record Winners"),
-                    Honor(title="The Invincibles", count="2003/04", subtitle="Unbeaten League Season"),
-                ]
-            )
+        known_players = [] if options["reset"] else list(Player.objects.order_by("id").values_list("name", flat=True))
+        digest = content_digest(
+            {
+                "players": list(dict.fromkeys(known_players + player_names)),
+                "facts": sorted(set(facts)),
+                "fragments": fragments,
+                "keywords": keywords,
+                "honors": honors,
+                "timeline": timeline,
+                "links": links,
+            }
+        )
+        if not (options["reset"] or options["force"]):
+            if ContentVersion.objects.filter(key="seed", digest=digest).exists():
+                self.stdout.write(self.style.SUCCESS("Seed unchanged"))
+                return
+
+        with transaction.atomic():
+            if options["reset"]:
+                delete_lines(PreGeneratedLine.objects.all())
+                reset_cursors()
+                Player.objects.all().delete()
+                Fact.objects.all().delete()
+                Fragment.objects.all().delete()
+                KeywordResponse.objects.all().delete()
+                Honor.objects.all().delete()
+                TimelineItem.objects.all().delete()
+                InfoLink.objects.all().delete()
 
-        if TimelineItem.objects.count() == 0:
-            TimelineItem.objects.bulk_create(
+            create_missing(Player, "name", player_names)
+            create_missing(Fact, "text", facts)
+
+            existing_fragments = set(Fragment.objects.values_list("category", "text"))
+            Fragment.objects.bulk_create(
                 [
-                    TimelineItem(title="Woolwich Origins", period="1886", description="Founded in Woolwich and built from humble roots."),
-                    TimelineItem(title="Highbury Era", period="1913–2006", description="A historic home that shaped the club's identity."),
-                    TimelineItem(title="Emirates Stadium", period="2006–Present", description="Modern home with elite ambitions."),
-                    TimelineItem(title="Wenger Era", period="1996–2018", description="Style, trophies, and a global football legacy."),
-                    TimelineItem(title="Arteta Era", period="2019–Present", description="Control, youth, and a new Arsenal standard."),
-                ]
+                    Fragment(category=category, text=text, weight=weight)
+                    for category, text, weight in fragments
+                    if (category, text) not in existing_fragments
+                ],
+                batch_size=500,
             )
+            Fragment.objects.filter(category="emoji").delete()
+
+            self.generate_lines()
+            self.clean_lines()
 
-        if InfoLink.objects.count() == 0:
-            InfoLink.objects.bulk_create(
+            add_player_keywords(keywords, Player.objects.order_by("id").values_list("name", flat=True))
+            existing_keywords = set(KeywordResponse.objects.values_list("keyword", flat=True))
+            KeywordResponse.objects.bulk_create(
                 [
-                    InfoLink(title="Arsenal Official Website", url="https://www.arsenal.com/"),
-                    InfoLink(title="Arsenal on BBC Sport", url="https://www.bbc.com/sport/football/teams/arsenal"),
-                    InfoLink(title="Arsenal on Sky Sports", url="https://www.skysports.com/arsenal"),
-                    InfoLink(title="Arsenal Fixtures and Results", url="https://www.premierleague.com/clubs/1/Arsenal/fixtures"),
-                ]
+                    KeywordResponse(keyword=keyword, response=response)
+                    for keyword, response in keywords.items()
+                    if keyword not in existing_keywords
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
             )
 
+            if not Honor.objects.exists():
+                Honor.objects.bulk_create(
+                    [Honor(title=title, count=count, subtitle=subtitle) for title, count, subtitle in honors]
+                )
+            if not TimelineItem.objects.exists():
+                TimelineItem.objects.bulk_create(
+                    [
+                        TimelineItem(title=title, period=period, description=description)
+                        for title, period, description in timeline
+                    ]
+                )
+            if not InfoLink.objects.exists():
+                InfoLink.objects.bulk_create([InfoLink(title=title, url=url) for title, url in links])
+
+            ContentVersion.objects.update_or_create(key="seed", defaults={"digest": digest})
+
         self.stdout.write(self.style.SUCCESS("Seed complete"))
+
+    def generate_lines(self):
+        if PreGeneratedLine.objects.count() >= 10000:
+            return
+        players = Player.objects.count() or 1
+        generate_corpus(math.ceil(10000 / (len(INTENSITY_SLOTS) * players)))
+
+    def clean_lines(self):
+        has_emoji = Q()
+        for ch in EMOJI_CHARS:
+            has_emoji |= Q(text__contains=ch)
+        changed = []
+        for line in PreGeneratedLine.objects.filter(has_emoji).only("id", "text"):
+            cleaned = line.text
+            for ch in EMOJI_CHARS:
+                cleaned = cleaned.replace(ch, "")
+            cleaned = " ".join(cleaned.split())
+            if cleaned != line.text:
+                line.text = cleaned
+                changed.append(line)
+        PreGeneratedLine.objects.bulk_update(changed, ["text"], batch_size=500)
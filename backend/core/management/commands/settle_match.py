@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core.models import Prediction
+from core.services import settle_match
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("match_ids", nargs="*")
+        parser.add_argument("--pending", action="store_true")
+
+    def handle(self, *args, **options):
+        match_ids = list(options["match_ids"])
+        if options["pending"]:
+            match_ids += list(
+                Prediction.objects.filter(checked_at__isnull=True, kickoff__lte=timezone.now())
+                .values_list("match_id", flat=True)
+                .distinct()
+            )
+        if not match_ids:
+            raise CommandError("Pass one or more match ids or --pending.")
+        for match_id in dict.fromkeys(match_ids):
+            result = settle_match(match_id)
+            if result.get("error"):
+                self.stderr.write(f"{match_id}: {result['error']}")
+            else:
+                self.stdout.write(f"{match_id}: settled {result['settled']} predictions")
+        self.stdout.write(self.style.SUCCESS("Settlement complete"))
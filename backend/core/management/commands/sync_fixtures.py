@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.schedule import poll_interval
+from core.services import sync_fixtures
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true")
+        parser.add_argument("--loop", action="store_true")
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            close_old_connections()
+            try:
+                result = sync_fixtures(full=full)
+                if result.get("error"):
+                    self.stderr.write(f"Fixture sync failed: {result['error']}")
+                elif result["not_modified"]:
+                    self.stdout.write(f"Fixtures not modified ({'full' if result['full'] else 'window'} sync)")
+                else:
+                    self.stdout.write(f"Synced {result['changed']} fixtures ({'full' if result['full'] else 'window'} sync)")
+            except Exception as exc:
+                self.stderr.write(f"Fixture sync failed: {exc}")
+            if not options["loop"]:
+                break
+            full = False
+            time.sleep(poll_interval())
+        self.stdout.write(self.style.SUCCESS("Fixture sync complete"))
@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.services import warm_fixture_cache
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--interval", type=int, default=settings.CACHE_WARM_INTERVAL_SECONDS)
+        parser.add_argument("--margin", type=int, default=settings.CACHE_REFRESH_MARGIN_SECONDS)
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            try:
+                refreshed = warm_fixture_cache(options["margin"])
+                if refreshed:
+                    self.stdout.write(f"Refreshed {', '.join(refreshed)}")
+            except Exception as exc:
+                self.stderr.write(f"Cache warm failed: {exc}")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Cache warm complete"))
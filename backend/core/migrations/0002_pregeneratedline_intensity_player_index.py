@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pregeneratedline",
+            index=models.Index(fields=["intensity", "player"], name="core_line_intensity_player"),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def drop_duplicate_cache_rows(apps, schema_editor):
+    FixturesCache = apps.get_model("core", "FixturesCache")
+    seen = set()
+    duplicates = []
+    for row_id, cache_key in FixturesCache.objects.order_by("cache_key", "-expires_at", "-id").values_list("id", "cache_key"):
+        if cache_key in seen:
+            duplicates.append(row_id)
+        else:
+            seen.add(cache_key)
+    for start in range(0, len(duplicates), 500):
+        FixturesCache.objects.filter(id__in=duplicates[start:start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_pregeneratedline_intensity_player_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_cache_rows, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="fixturescache",
+            name="cache_key",
+            field=models.CharField(max_length=120, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name="fixturescache",
+            index=models.Index(fields=["cache_key", "expires_at"], name="core_cache_key_expires"),
+        ),
+    ]
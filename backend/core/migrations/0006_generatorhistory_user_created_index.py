@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_history_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="generatorhistory",
+            index=models.Index(fields=["user", "-created_at"], name="core_history_user_created"),
+        ),
+    ]
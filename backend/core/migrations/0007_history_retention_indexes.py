@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_generatorhistory_user_created_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(fields=["user", "-created_at"], name="core_chat_user_created"),
+        ),
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(fields=["created_at"], name="core_chat_created"),
+        ),
+        migrations.AddIndex(
+            model_name="generatorhistory",
+            index=models.Index(fields=["created_at"], name="core_history_created"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_contentversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Fixture",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("match_id", models.CharField(max_length=60, unique=True)),
+                ("kickoff", models.DateTimeField()),
+                ("competition", models.CharField(blank=True, max_length=120)),
+                ("home_team", models.CharField(max_length=120)),
+                ("away_team", models.CharField(max_length=120)),
+                ("status", models.CharField(max_length=20)),
+                ("home_score", models.IntegerField(blank=True, null=True)),
+                ("away_score", models.IntegerField(blank=True, null=True)),
+                ("last_updated", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["status", "kickoff"], name="core_fixture_status_kickoff"),
+                    models.Index(fields=["kickoff"], name="core_fixture_kickoff"),
+                ],
+            },
+        ),
+    ]
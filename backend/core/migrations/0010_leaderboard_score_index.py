@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_fixture"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["scope", "total_points", "correct_predictions", "user"], name="core_leaderboard_score"
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 
@@ -71,22 +72,53 @@ class PreGeneratedLine(models.Model):
     intensity = models.CharField(max_length=16, choices=INTENSITY_CHOICES)
     player = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["intensity", "player"], name="core_line_intensity_player")]
+
 
 class GeneratorHistory(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     output_text = models.TextField()
     mode = models.CharField(max_length=32)
     player = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="core_history_user_created"),
+            models.Index(fields=["created_at"], name="core_history_created"),
+        ]
 
 
 class FixturesCache(models.Model):
-    cache_key = models.CharField(max_length=120, db_index=True)
+    cache_key = models.CharField(max_length=120, unique=True)
     match_id = models.CharField(max_length=60, blank=True)
     payload = models.JSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [models.Index(fields=["cache_key", "expires_at"], name="core_cache_key_expires")]
+
+
+class Fixture(models.Model):
+    match_id = models.CharField(max_length=60, unique=True)
+    kickoff = models.DateTimeField()
+    competition = models.CharField(max_length=120, blank=True)
+    home_team = models.CharField(max_length=120)
+    away_team = models.CharField(max_length=120)
+    status = models.CharField(max_length=20)
+    home_score = models.IntegerField(null=True, blank=True)
+    away_score = models.IntegerField(null=True, blank=True)
+    last_updated = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "kickoff"], name="core_fixture_status_kickoff"),
+            models.Index(fields=["kickoff"], name="core_fixture_kickoff"),
+        ]
+
 
 class Prediction(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -114,6 +146,26 @@ class UserStats(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 
+class LeaderboardEntry(models.Model):
+    scope = models.CharField(max_length=96)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    total_points = models.IntegerField(default=0)
+    correct_predictions = models.IntegerField(default=0)
+    total_predictions = models.IntegerField(default=0)
+    position = models.IntegerField(default=0)
+    rank = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["scope", "user"], name="core_leaderboard_scope_user")]
+        indexes = [
+            models.Index(fields=["scope", "position"], name="core_leaderboard_position"),
+            models.Index(
+                fields=["scope", "total_points", "correct_predictions", "user"], name="core_leaderboard_score"
+            ),
+        ]
+
+
 class KeywordResponse(models.Model):
     keyword = models.CharField(max_length=80, unique=True)
     response = models.TextField()
@@ -123,7 +175,13 @@ class ChatMessage(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     role = models.CharField(max_length=16)
     text = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="core_chat_user_created"),
+            models.Index(fields=["created_at"], name="core_chat_created"),
+        ]
 
 
 class Honor(models.Model):
@@ -141,3 +199,9 @@ class TimelineItem(models.Model):
 class InfoLink(models.Model):
     title = models.CharField(max_length=160)
     url = models.URLField()
+
+
+class ContentVersion(models.Model):
+    key = models.CharField(max_length=60, unique=True)
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from .profiles import profile_cache
 
 
 class IsArsenalAllowed(BasePermission):
@@ -7,9 +8,14 @@ class IsArsenalAllowed(BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        profile = getattr(request.user, "profile", None)
-        if not profile:
-            return True
-        if profile.favorite_club in ["Tottenham Hotspur", "Chelsea"]:
+        claims = getattr(request.user, "token", None)
+        if claims is not None and "club" in claims:
+            favorite_club = claims["club"]
+        else:
+            profile = profile_cache.get(request.user.id)
+            if not profile:
+                return True
+            favorite_club = profile["favorite_club"]
+        if favorite_club in ["Tottenham Hotspur", "Chelsea"]:
             return False
         return True
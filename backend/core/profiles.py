@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import caches
+from .models import Profile
+
+
+DEFAULT_PROFILE = {"favorite_club": "Arsenal", "banter_mode": False}
+
+
+class ProfileCache:
+    def __init__(self, alias="default", prefix="profile:", version=1, ttl=300):
+        self.alias = alias
+        self.prefix = prefix
+        self.version = version
+        self.ttl = ttl
+
+    def version_key(self, user_id):
+        return f"{self.prefix}ver:{user_id}"
+
+    def key(self, user_id, user_version):
+        return f"{self.prefix}{user_id}:{user_version}"
+
+    def get(self, user_id):
+        cache = caches[self.alias]
+        user_version = cache.get_or_set(self.version_key(user_id), 1, timeout=None, version=self.version)
+        data = cache.get(self.key(user_id, user_version), version=self.version)
+        if data is None:
+            data = Profile.objects.filter(user_id=user_id).values("favorite_club", "banter_mode").first() or {}
+            cache.set(self.key(user_id, user_version), data, timeout=self.ttl, version=self.version)
+        return data or None
+
+    def invalidate(self, user_id):
+        cache = caches[self.alias]
+        cache.add(self.version_key(user_id), 1, timeout=None, version=self.version)
+        cache.incr(self.version_key(user_id), version=self.version)
+
+
+def ensure_profile(user):
+    data = profile_cache.get(user.id)
+    if data is None:
+        profile, _ = Profile.objects.get_or_create(user=user, defaults=DEFAULT_PROFILE)
+        data = {"favorite_club": profile.favorite_club, "banter_mode": profile.banter_mode}
+    return data
+
+
+profile_cache = ProfileCache(
+    alias=settings.PROFILE_CACHE_ALIAS,
+    version=settings.PROFILE_CACHE_VERSION,
+    ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+)
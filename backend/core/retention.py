@@ -0,0 +1,78 @@
+import gzip
+import json
+import time
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+class JsonlArchive:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, model, rows):
+        if self._file is None:
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        label = model._meta.label
+        for row in rows:
+            self._file.write(json.dumps({"model": label, **row}, cls=DjangoJSONEncoder) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Pruner:
+    def __init__(self, batch_size=1000, pause=0.1, archive=None, dry_run=False):
+        self.batch_size = batch_size
+        self.pause = pause
+        self.archive = archive
+        self.dry_run = dry_run
+
+    def delete(self, model, qs):
+        if self.dry_run:
+            return qs.count()
+        fields = [field.attname for field in model._meta.concrete_fields]
+        deleted = 0
+        while True:
+            if self.archive:
+                rows = list(qs.order_by("id").values(*fields)[: self.batch_size])
+                ids = [row["id"] for row in rows]
+            else:
+                ids = list(qs.order_by("id").values_list("id", flat=True)[: self.batch_size])
+            if not ids:
+                return deleted
+            if self.archive:
+                self.archive.write(model, rows)
+            model.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            if self.pause:
+                time.sleep(self.pause)
+
+    def prune(self, model, keep=0, days=0):
+        deleted = 0
+        rows = model.objects.all()
+        if days:
+            cutoff = timezone.now() - timedelta(days=days)
+            deleted += self.delete(model, rows.filter(created_at__lt=cutoff))
+            rows = rows.filter(created_at__gte=cutoff)
+        if keep:
+            deleted += self.prune_per_user(model, rows, keep)
+        return deleted
+
+    def prune_per_user(self, model, rows, keep):
+        deleted = 0
+        crowded = rows.values("user_id").annotate(total=Count("id")).filter(total__gt=keep).values_list("user_id", flat=True)
+        for user_id in list(crowded):
+            user_rows = rows.filter(user_id=user_id)
+            boundary = user_rows.order_by("-created_at", "-id").values_list("created_at", "id")[keep : keep + 1].first()
+            if not boundary:
+                continue
+            created_at, row_id = boundary
+            deleted += self.delete(
+                model, user_rows.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=row_id))
+            )
+        return deleted
@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from django.conf import settings
+from .models import Fragment, Fact, Player, PreGeneratedLine
+
+
+class WeightedSampler:
+    def __init__(self, items):
+        self.values = []
+        self.cumulative = []
+        total = 0
+        for value, weight in items:
+            if weight <= 0:
+                continue
+            total += weight
+            self.values.append(value)
+            self.cumulative.append(total)
+        self.total = total
+
+    def __len__(self):
+        return len(self.values)
+
+    def pick(self):
+        if not self.values:
+            return None
+        return self.values[bisect_right(self.cumulative, random.randrange(self.total))]
+
+
+class FragmentSampler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samplers = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._samplers = None
+            self._expires_at = 0.0
+
+    def _load(self):
+        grouped = {}
+        for category, text, weight in Fragment.objects.values_list("category", "text", "weight").order_by("id"):
+            grouped.setdefault(category, []).append((text, weight))
+        return {category: WeightedSampler(items) for category, items in grouped.items()}
+
+    def samplers(self):
+        samplers = self._samplers
+        if samplers is not None and time.monotonic() < self._expires_at:
+            return samplers
+        with self._lock:
+            if self._samplers is None or time.monotonic() >= self._expires_at:
+                self._samplers = self._load()
+                self._expires_at = time.monotonic() + settings.SAMPLER_TTL_SECONDS
+            return self._samplers
+
+    def pick(self, category):
+        sampler = self.samplers().get(category)
+        if not sampler:
+            return ""
+        return sampler.pick() or ""
+
+
+fragment_sampler = FragmentSampler()
+
+
+class RandomRowSampler:
+    def __init__(self, model, related=(), max_buckets=256):
+        self.model = model
+        self.related = related
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+    def ids(self, **filters):
+        key = tuple(sorted(filters.items()))
+        bucket = self._buckets.get(key)
+        if bucket is not None and time.monotonic() < bucket[0]:
+            return key, bucket[1]
+        ids = array("q", self.model.objects.filter(**filters).order_by("pk").values_list("pk", flat=True))
+        with self._lock:
+            self._buckets[key] = (time.monotonic() + settings.SAMPLER_TTL_SECONDS, ids)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return key, ids
+
+    def pick(self, **filters):
+        for _ in range(2):
+            key, ids = self.ids(**filters)
+            if not ids:
+                return None
+            row = self.model.objects.select_related(*self.related).filter(pk=random.choice(ids)).first()
+            if row:
+                return row
+            self.invalidate(key)
+        return None
+
+    def sample(self, k, replace=False, **filters):
+        key, ids = self.ids(**filters)
+        if not ids or k <= 0:
+            return []
+        if replace:
+            chosen = random.choices(ids, k=k)
+        else:
+            chosen = random.sample(ids, min(k, len(ids)))
+        rows = self.model.objects.select_related(*self.related).in_bulk(set(chosen))
+        if len(rows) < len(set(chosen)):
+            self.invalidate(key)
+        return [rows[pk] for pk in chosen if pk in rows]
+
+
+line_sampler = RandomRowSampler(PreGeneratedLine, related=("player",))
+fact_sampler = RandomRowSampler(Fact)
+player_sampler = RandomRowSampler(Player)
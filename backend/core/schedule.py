@@ -0,0 +1,166 @@
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import ContentVersion, Fixture
+
+
+UPCOMING_STATUSES = ["SCHEDULED", "TIMED"]
+DONE_STATUSES = ["FINISHED", "AWARDED", "POSTPONED", "CANCELLED", "SUSPENDED"]
+FIXTURE_FIELDS = [
+    "kickoff",
+    "competition",
+    "home_team",
+    "away_team",
+    "status",
+    "home_score",
+    "away_score",
+    "last_updated",
+    "updated_at",
+]
+
+
+def fixture_row(match):
+    kickoff = parse_datetime(match.get("utcDate") or "")
+    home_team = (match.get("homeTeam") or {}).get("name")
+    away_team = (match.get("awayTeam") or {}).get("name")
+    if not match.get("id") or not kickoff or not home_team or not away_team:
+        return None
+    score = (match.get("score") or {}).get("fullTime") or {}
+    return Fixture(
+        match_id=str(match["id"]),
+        kickoff=kickoff,
+        competition=(match.get("competition") or {}).get("name") or "",
+        home_team=home_team,
+        away_team=away_team,
+        status=match.get("status") or "",
+        home_score=score.get("home"),
+        away_score=score.get("away"),
+        last_updated=parse_datetime(match.get("lastUpdated") or ""),
+    )
+
+
+def store_fixtures(matches):
+    rows = {row.match_id: row for row in map(fixture_row, matches) if row}
+    known = dict(Fixture.objects.filter(match_id__in=list(rows)).values_list("match_id", "last_updated"))
+    changed = [
+        row
+        for match_id, row in rows.items()
+        if match_id not in known or row.last_updated is None or row.last_updated != known[match_id]
+    ]
+    Fixture.objects.bulk_create(
+        changed,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["match_id"],
+        update_fields=FIXTURE_FIELDS,
+    )
+    return len(changed)
+
+
+def sync_window(full, now=None):
+    if full:
+        return {}
+    now = now or timezone.now()
+    until = now + timedelta(days=settings.FIXTURE_SYNC_WINDOW_DAYS)
+    upcoming = upcoming_fixture()
+    if upcoming and upcoming.kickoff > until:
+        until = upcoming.kickoff
+    return {
+        "dateFrom": (now - timedelta(days=2)).date().isoformat(),
+        "dateTo": until.date().isoformat(),
+    }
+
+
+def needs_full_sync():
+    last_full = ContentVersion.objects.filter(key="fixtures_full").values_list("updated_at", flat=True).first()
+    if last_full is None or not Fixture.objects.exists():
+        return True
+    return last_full <= timezone.now() - timedelta(hours=settings.FIXTURE_FULL_SYNC_HOURS)
+
+
+def sync_etag(key):
+    return ContentVersion.objects.filter(key=key).values_list("digest", flat=True).first() or ""
+
+
+def record_sync(key, etag):
+    ContentVersion.objects.update_or_create(key=key, defaults={"digest": etag if len(etag) <= 64 else ""})
+
+
+def upcoming_fixture():
+    return (
+        Fixture.objects.filter(status__in=UPCOMING_STATUSES, kickoff__gt=timezone.now())
+        .order_by("kickoff")
+        .first()
+    )
+
+
+def last_synced():
+    synced = ContentVersion.objects.filter(key__in=["fixtures_full", "fixtures_window"]).aggregate(
+        synced=Max("updated_at")
+    )
+    return synced["synced"]
+
+
+def next_scheduled_match():
+    if not settings.FIXTURE_SCHEDULE_ENABLED:
+        return None
+    fixture = upcoming_fixture()
+    if not fixture:
+        return None
+    synced = last_synced()
+    stale = synced is None or synced <= timezone.now() - timedelta(seconds=settings.FIXTURE_STALE_SECONDS)
+    return {
+        "match_id": fixture.match_id,
+        "utcDate": fixture.kickoff.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "competition": fixture.competition,
+        "homeTeam": fixture.home_team,
+        "awayTeam": fixture.away_team,
+        "status": fixture.status,
+        "stale": stale,
+    }
+
+
+def finished_result(match_id):
+    fixture = (
+        Fixture.objects.filter(
+            match_id=str(match_id), status="FINISHED", home_score__isnull=False, away_score__isnull=False
+        )
+        .only("match_id", "status", "home_score", "away_score")
+        .first()
+    )
+    if not fixture:
+        return None
+    return {
+        "id": fixture.match_id,
+        "status": fixture.status,
+        "score": {"fullTime": {"home": fixture.home_score, "away": fixture.away_score}},
+    }
+
+
+def poll_interval(now=None):
+    now = now or timezone.now()
+    live_seconds = settings.FIXTURE_POLL_LIVE_SECONDS
+    prematch = timedelta(minutes=settings.FIXTURE_PREMATCH_MINUTES)
+    in_window = (
+        Fixture.objects.filter(
+            kickoff__lte=now + prematch,
+            kickoff__gte=now - timedelta(minutes=settings.FIXTURE_MATCH_MINUTES),
+        )
+        .exclude(status__in=DONE_STATUSES)
+        .exists()
+    )
+    if in_window:
+        return live_seconds
+    next_kickoff = (
+        Fixture.objects.filter(status__in=UPCOMING_STATUSES, kickoff__gt=now)
+        .order_by("kickoff")
+        .values_list("kickoff", flat=True)
+        .first()
+    )
+    idle_seconds = settings.FIXTURE_POLL_IDLE_SECONDS
+    if next_kickoff is None:
+        return idle_seconds
+    until_window = (next_kickoff - prematch - now).total_seconds()
+    return max(live_seconds, min(idle_seconds, until_window))
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import User
 from django.db import transaction
 from django.contrib.auth.password_validation import validate_password
+from django.utils.crypto import salted_hmac
 from rest_framework import serializers
 from .models import (
     Profile,
@@ -10,6 +11,7 @@ from .models import (
     TimelineItem,
     InfoLink,
     UserStats,
+    LeaderboardEntry,
     FAVORITE_CLUB_CHOICES,
     INTENSITY_CHOICES,
 )
@@ -91,6 +93,39 @@ class PredictionSerializer(serializers.ModelSerializer):
         ]
 
 
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    display_name = serializers.SerializerMethodField()
+    accuracy = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = [
+            "rank",
+            "position",
+            "display_name",
+            "total_points",
+            "correct_predictions",
+            "total_predictions",
+            "accuracy",
+        ]
+
+    def get_display_name(self, obj):
+        return f"Gooner {salted_hmac('leaderboard', str(obj.user_id)).hexdigest()[:8]}"
+
+    def get_accuracy(self, obj):
+        if not obj.total_predictions:
+            return 0.0
+        return round((obj.correct_predictions / obj.total_predictions) * 100, 2)
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    scope = serializers.ChoiceField(choices=[("global", "global"), ("club", "club"), ("season", "season")], default="global")
+    club = serializers.ChoiceField(choices=FAVORITE_CLUB_CHOICES, required=False)
+    season = serializers.RegexField(r"^\d{4}-\d{2}$", required=False)
+    page = serializers.IntegerField(required=False, default=1, min_value=1)
+    page_size = serializers.IntegerField(required=False, default=25, min_value=1, max_value=100)
+
+
 class HonorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Honor
@@ -117,3 +152,4 @@ class GenerateSerializer(serializers.Serializer):
     mode = serializers.ChoiceField(choices=[("fact", "fact"), ("praise", "praise"), ("nostalgia", "nostalgia")])
     player = serializers.CharField(required=False, allow_blank=True)
     intensity = serializers.ChoiceField(choices=INTENSITY_CHOICES)
+    count = serializers.IntegerField(required=False, default=1, min_value=1, max_value=50)
@@ -1,11 +1,23 @@
-import random
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, Round
 from django.utils import timezone
-from .models import FixturesCache, Player, Fact, Fragment, PreGeneratedLine, GeneratorHistory
+from . import leaderboard
+from .cache import fixtures_cache
+from .history import output_digest, recent_outputs
+from .models import Player, GeneratorHistory, Prediction, UserStats
+from .schedule import finished_result, needs_full_sync, next_scheduled_match, record_sync, store_fixtures, sync_etag, sync_window
+from .sampling import fragment_sampler, line_sampler, fact_sampler, player_sampler
+from .singleflight import upstream_flight, background_refresher
+from .upstream import football_data_client, sportsdb_client, UpstreamError, CircuitOpenError
+from .writebehind import history_buffer
 
 
+badge_executor = ThreadPoolExecutor(max_workers=settings.BADGE_FETCH_WORKERS, thread_name_prefix="badges")
+
 EMOJI_CHARS = ["🔴", "⚪", "🔥", "💫", "🎯", "🧠", "⚡", "🛡️", "🚀", "🏟️", "🌟", "👑", "💥", "🧩", "🔝", "🫶", "🏆"]
 
 
@@ -17,24 +29,11 @@ def clean_text(text):
 
 
 def get_cached_value(cache_key, allow_expired=False):
-    now = timezone.now()
-    qs = FixturesCache.objects.filter(cache_key=cache_key)
-    if not allow_expired:
-        qs = qs.filter(expires_at__gt=now)
-    cached = qs.order_by("-expires_at").first()
-    if cached:
-        return cached.payload
-    return None
+    return fixtures_cache.get(cache_key, allow_expired=allow_expired)
 
 
 def set_cache_value(cache_key, payload, ttl_minutes, match_id=""):
-    expires_at = timezone.now() + timedelta(minutes=ttl_minutes)
-    FixturesCache.objects.create(
-        cache_key=cache_key,
-        match_id=match_id,
-        payload=payload,
-        expires_at=expires_at,
-    )
+    fixtures_cache.set(cache_key, payload, ttl_minutes, match_id=match_id)
 
 def is_complete_match_payload(payload):
     if not payload:
@@ -50,45 +49,111 @@ def is_complete_match_payload(payload):
 def fetch_football_data(path, params=None):
     if not settings.FOOTBALL_DATA_API_KEY:
         return {"error": "Missing API key"}
-    url = f"https://api.football-data.org/v4{path}"
-    headers = {
-        "X-Auth-Token": settings.FOOTBALL_DATA_API_KEY,
-        "User-Agent": "ArsenalAura/1.0 (+https://arsenalaura.vercel.app/)",
-    }
-    last_error = None
-    for attempt in range(3):
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=20)
-            if response.status_code >= 400:
-                return {"error": "Upstream error", "status": response.status_code, "body": response.text}
-            return response.json()
-        except requests.RequestException as exc:
-            last_error = exc
-    return {"error": "Network error"}
+    try:
+        response = football_data_client().get(path, params=params)
+    except CircuitOpenError:
+        return {"error": "Upstream unavailable"}
+    except UpstreamError:
+        return {"error": "Network error"}
+    return football_data_payload(response)
+
+
+def football_data_payload(response):
+    if response.status_code >= 400:
+        return {"error": "Upstream error", "status": response.status_code, "body": response.text}
+    try:
+        return response.json()
+    except ValueError:
+        return {"error": "Invalid upstream response"}
 
 
 def fetch_sportsdb(path, params=None):
     if not settings.SPORTS_DB_API_KEY:
         return None
-    url = f"https://www.thesportsdb.com/api/v1/json/{settings.SPORTS_DB_API_KEY}{path}"
     try:
-        response = requests.get(url, params=params, timeout=15)
-        if response.status_code >= 400:
-            return None
+        response = sportsdb_client().get(path, params=params)
+    except UpstreamError:
+        return None
+    return sportsdb_payload(response)
+
+
+def sportsdb_payload(response):
+    if response.status_code >= 400:
+        return None
+    try:
         return response.json()
-    except requests.RequestException:
+    except ValueError:
         return None
 
 
+def badge_cache_key(team_name):
+    normalized = team_name.replace(" FC", "").strip()
+    return normalized, f"badge_{normalized.lower()}"
+
+
 def get_team_badge(team_name):
     if not team_name:
         return None
-    normalized = team_name.replace(" FC", "").strip()
-    cache_key = f"badge_{normalized.lower()}"
+    normalized, cache_key = badge_cache_key(team_name)
     cached = get_cached_value(cache_key)
     if cached:
         return cached.get("badge")
-    data = fetch_sportsdb("/searchteams.php", params={"t": normalized})
+    stale = stale_badge(cache_key)
+    if stale:
+        background_refresher.submit(cache_key, lambda: fetch_team_badge(normalized, cache_key))
+        return stale
+    return upstream_flight.do(
+        cache_key,
+        lambda: fetch_team_badge(normalized, cache_key),
+        stale=lambda: stale_badge(cache_key),
+    )
+
+
+def get_team_badges(team_names, force=False):
+    keys = {team_name: badge_cache_key(team_name) for team_name in team_names if team_name}
+    entries = {}
+    if not force:
+        entries = fixtures_cache.get_entries([cache_key for _, cache_key in keys.values()], allow_expired=True)
+    now = timezone.now()
+    badges = {}
+    futures = {}
+    for team_name, (normalized, cache_key) in keys.items():
+        entry = entries.get(cache_key)
+        badge = entry[0].get("badge") if entry else None
+        if badge and entry[1] <= now:
+            background_refresher.submit(cache_key, lambda normalized=normalized, cache_key=cache_key: fetch_team_badge(normalized, cache_key))
+        if badge:
+            badges[team_name] = badge
+        else:
+            futures[team_name] = badge_executor.submit(load_team_badge, normalized, cache_key, force)
+    for team_name, future in futures.items():
+        badges[team_name] = future.result()
+    return badges
+
+
+def load_team_badge(normalized, cache_key, force=False):
+    try:
+        return upstream_flight.do(cache_key, lambda: fetch_team_badge(normalized, cache_key, force=force))
+    finally:
+        close_old_connections()
+
+
+def stale_badge(cache_key):
+    stale = get_cached_value(cache_key, allow_expired=True)
+    if stale:
+        return stale.get("badge")
+    return None
+
+
+def fetch_team_badge(normalized, cache_key, force=False):
+    if not force:
+        cached = get_cached_value(cache_key)
+        if cached:
+            return cached.get("badge")
+    return store_badge(cache_key, fetch_sportsdb("/searchteams.php", params={"t": normalized}))
+
+
+def store_badge(cache_key, data):
     if not data or not data.get("teams"):
         return None
     badge = data["teams"][0].get("strTeamBadge")
@@ -97,11 +162,19 @@ def get_team_badge(team_name):
     return badge
 
 
-def get_arsenal_team_id():
+def get_arsenal_team_id(force=False):
+    team_id = known_arsenal_team_id(force)
+    if team_id:
+        return team_id
+    return store_arsenal_team_id(fetch_football_data("/competitions/PL/teams"))
+
+
+def known_arsenal_team_id(force=False):
     cache_key = "pl_team_id_arsenal"
-    cached = get_cached_value(cache_key)
-    if cached:
-        return cached.get("team_id")
+    if not force:
+        cached = get_cached_value(cache_key)
+        if cached:
+            return cached.get("team_id")
     if settings.ARSENAL_TEAM_ID:
         try:
             team_id = int(settings.ARSENAL_TEAM_ID)
@@ -109,7 +182,11 @@ def get_arsenal_team_id():
             return team_id
         except ValueError:
             pass
-    data = fetch_football_data("/competitions/PL/teams")
+    return None
+
+
+def store_arsenal_team_id(data):
+    cache_key = "pl_team_id_arsenal"
     if data.get("error"):
         stale = get_cached_value(cache_key, allow_expired=True)
         if stale:
@@ -133,18 +210,84 @@ def get_arsenal_team_id():
     return team_id
 
 
+def sync_fixtures(full=False):
+    if not settings.FOOTBALL_DATA_API_KEY:
+        return {"error": "Missing API key"}
+    team_id = get_arsenal_team_id()
+    if not team_id:
+        return {"error": "Could not find Arsenal team id"}
+    full = full or needs_full_sync()
+    sync_key = "fixtures_full" if full else "fixtures_window"
+    etag = sync_etag(sync_key)
+    try:
+        response = football_data_client().get(
+            f"/teams/{team_id}/matches",
+            params=sync_window(full),
+            headers={"If-None-Match": etag} if etag else None,
+        )
+    except CircuitOpenError:
+        return {"error": "Upstream unavailable"}
+    except UpstreamError:
+        return {"error": "Network error"}
+    if response.status_code == 304:
+        record_sync(sync_key, etag)
+        return {"full": full, "changed": 0, "not_modified": True}
+    data = football_data_payload(response)
+    if data.get("error"):
+        return data
+    changed = store_fixtures(data.get("matches", []))
+    record_sync(sync_key, response.headers.get("ETag", ""))
+    return {"full": full, "changed": changed, "not_modified": False}
+
+
 def get_next_match():
+    scheduled = next_scheduled_match()
+    if scheduled and not scheduled["stale"]:
+        return scheduled
+    match = get_upstream_next_match()
+    if match.get("error") and scheduled:
+        return scheduled
+    return match
+
+
+def get_upstream_next_match():
     cache_key = "arsenal_next_match"
     cached = get_cached_value(cache_key)
     if cached and is_complete_match_payload(cached):
         return {**cached, "stale": False}
+    stale = stale_next_match()
+    if stale:
+        background_refresher.submit(cache_key, fetch_next_match)
+        return stale
+    return upstream_flight.do(cache_key, fetch_next_match, stale=stale_next_match)
+
+
+def stale_next_match():
+    stale = get_cached_value("arsenal_next_match", allow_expired=True)
+    if stale and is_complete_match_payload(stale):
+        return {**stale, "stale": True}
+    return None
+
+
+def fetch_next_match(force=False):
+    cache_key = "arsenal_next_match"
+    if not force:
+        cached = get_cached_value(cache_key)
+        if cached and is_complete_match_payload(cached):
+            return {**cached, "stale": False}
     team_id = get_arsenal_team_id()
     if not team_id:
         stale = get_cached_value(cache_key, allow_expired=True)
         if stale and is_complete_match_payload(stale):
             return {**stale, "stale": True}
         return {"error": "Could not find Arsenal team id"}
-    data = fetch_football_data(f"/teams/{team_id}/matches", params={"status": "SCHEDULED", "limit": 10})
+    return store_next_match(
+        fetch_football_data(f"/teams/{team_id}/matches", params={"status": "SCHEDULED", "limit": 10})
+    )
+
+
+def store_next_match(data):
+    cache_key = "arsenal_next_match"
     if data.get("error"):
         stale = get_cached_value(cache_key, allow_expired=True)
         if stale and is_complete_match_payload(stale):
@@ -183,12 +326,92 @@ def get_next_match():
     return {**payload, "stale": False}
 
 
+def next_fixture():
+    fixture = describe_fixture(get_next_match())
+    if not fixture.get("unavailable"):
+        badges = get_team_badges([fixture["homeTeam"], fixture["awayTeam"]])
+        fixture["homeBadge"] = badges.get(fixture["homeTeam"])
+        fixture["awayBadge"] = badges.get(fixture["awayTeam"])
+    return fixture
+
+
+def describe_fixture(data):
+    if data.get("error"):
+        return {"unavailable": True, "detail": data["error"]}
+    home_team = data.get("homeTeam")
+    away_team = data.get("awayTeam")
+    utc_date = data.get("utcDate")
+    if not data.get("match_id") or not home_team or not away_team or not utc_date:
+        return {"unavailable": True, "detail": "Match data incomplete."}
+
+    def is_arsenal(name):
+        return name and "Arsenal" in name
+
+    arsenal_is_home = is_arsenal(home_team)
+    opponent = away_team if arsenal_is_home else home_team
+    if is_arsenal(opponent):
+        return {"unavailable": True, "detail": "Opponent data unavailable."}
+    return {
+        "match_id": data.get("match_id"),
+        "utcDate": utc_date,
+        "competition": data.get("competition"),
+        "homeTeam": home_team,
+        "awayTeam": away_team,
+        "status": data.get("status"),
+        "arsenal_is_home": arsenal_is_home,
+        "opponent": opponent,
+        "stale": data.get("stale", False),
+    }
+
+
+def expires_within(cache_key, seconds):
+    entry = fixtures_cache.get_entry(cache_key, allow_expired=True)
+    return entry is None or entry[1] <= timezone.now() + timedelta(seconds=seconds)
+
+
+def warm_fixture_cache(margin_seconds):
+    refreshed = []
+    if expires_within("pl_team_id_arsenal", margin_seconds):
+        upstream_flight.do("pl_team_id_arsenal", lambda: get_arsenal_team_id(force=True))
+        refreshed.append("pl_team_id_arsenal")
+    match = next_scheduled_match()
+    if match and match["stale"]:
+        match = None
+    if not match and expires_within("arsenal_next_match", margin_seconds):
+        upstream_flight.do("arsenal_next_match", lambda: fetch_next_match(force=True))
+        refreshed.append("arsenal_next_match")
+    match = match or get_cached_value("arsenal_next_match", allow_expired=True) or {}
+    for team_name in [match.get("homeTeam"), match.get("awayTeam")]:
+        if not team_name:
+            continue
+        normalized, cache_key = badge_cache_key(team_name)
+        if expires_within(cache_key, margin_seconds):
+            upstream_flight.do(cache_key, lambda: fetch_team_badge(normalized, cache_key, force=True))
+            refreshed.append(cache_key)
+    return refreshed
+
+
 def get_match_result(match_id):
+    stored = finished_result(match_id)
+    if stored:
+        return stored
+    cache_key = f"match_result_{match_id}"
+    cached = get_cached_value(cache_key)
+    if cached:
+        return cached
+    return upstream_flight.do(cache_key, lambda: fetch_match_result(match_id))
+
+
+def fetch_match_result(match_id):
     cache_key = f"match_result_{match_id}"
     cached = get_cached_value(cache_key)
     if cached:
         return cached
-    data = fetch_football_data(f"/matches/{match_id}")
+    return store_match_result(match_id, fetch_football_data(f"/matches/{match_id}"))
+
+
+def store_match_result(match_id, data):
+    cache_key = f"match_result_{match_id}"
     if data.get("error"):
         return data
     match = data.get("match")
@@ -198,13 +421,94 @@ def get_match_result(match_id):
     return match
 
 
+def score_prediction(prediction, home_score, away_score):
+    arsenal_goals = home_score if prediction.arsenal_is_home else away_score
+    opponent_goals = away_score if prediction.arsenal_is_home else home_score
+    predicted_arsenal = prediction.predicted_home
+    predicted_opponent = prediction.predicted_away
+    exact = arsenal_goals == predicted_arsenal and opponent_goals == predicted_opponent
+    outcome = (
+        (arsenal_goals > opponent_goals and predicted_arsenal > predicted_opponent)
+        or (arsenal_goals == opponent_goals and predicted_arsenal == predicted_opponent)
+        or (arsenal_goals < opponent_goals and predicted_arsenal < predicted_opponent)
+    )
+    if exact:
+        return 3
+    if outcome:
+        return 1
+    return 0
+
+
+def prediction_message(prediction):
+    arsenal_goals = prediction.actual_home if prediction.arsenal_is_home else prediction.actual_away
+    opponent_goals = prediction.actual_away if prediction.arsenal_is_home else prediction.actual_home
+    exact = prediction.points == 3
+    outcome = prediction.points == 1
+    if arsenal_goals > opponent_goals:
+        if exact:
+            return "Emirates prophet. You saw it all coming."
+        if outcome:
+            return "Ball knowledge detected. You called the result."
+        return "Win secured, but the scoreline got away from you."
+    if arsenal_goals == opponent_goals:
+        if exact:
+            return "You read the stalemate perfectly."
+        if outcome:
+            return "Draw vibes felt. Solid call."
+        return "The draw came, but your numbers were bold."
+    if exact:
+        return "Unlucky exact call. You sensed the wrong way."
+    if outcome:
+        return "You predicted the pain. Gooner resilience."
+    return "You jinxed it, gooner. We go again."
+
+
+def settle_match(match_id, match=None):
+    if match is None:
+        match = get_match_result(match_id)
+    if match.get("error"):
+        return {"error": match["error"], "status": 502}
+    if match.get("status") != "FINISHED":
+        return {"error": "Match not finished yet.", "status": 400}
+    score = match.get("score", {}).get("fullTime", {})
+    home_score = score.get("home")
+    away_score = score.get("away")
+    if home_score is None or away_score is None:
+        return {"error": "Score not available.", "status": 400}
+    now = timezone.now()
+    with transaction.atomic():
+        Prediction.objects.filter(match_id=match_id, checked_at__isnull=True).update(
+            checked_at=now, locked=True, actual_home=home_score, actual_away=away_score
+        )
+        predictions = list(Prediction.objects.filter(match_id=match_id, checked_at=now))
+        if not predictions:
+            return {"settled": 0}
+        users_by_points = {}
+        for prediction in predictions:
+            prediction.points = score_prediction(prediction, home_score, away_score)
+            users_by_points.setdefault(prediction.points, []).append(prediction.user_id)
+        Prediction.objects.bulk_update([p for p in predictions if p.points], ["points"], batch_size=500)
+        user_ids = {prediction.user_id for prediction in predictions}
+        UserStats.objects.bulk_create([UserStats(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+        for points, point_user_ids in users_by_points.items():
+            UserStats.objects.filter(user_id__in=point_user_ids).update(
+                total_predictions=F("total_predictions") + 1,
+                correct_predictions=F("correct_predictions") + (1 if points > 0 else 0),
+                streak=F("streak") + 1 if points > 0 else Value(0),
+                total_points=F("total_points") + points,
+                updated_at=now,
+            )
+        UserStats.objects.filter(user_id__in=user_ids, total_predictions__gt=0).update(
+            accuracy=Round(
+                Cast("correct_predictions", FloatField()) * 100.0 / Cast("total_predictions", FloatField()), 2
+            )
+        )
+        leaderboard.apply_settlement(predictions)
+    return {"settled": len(predictions)}
+
+
 def pick_fragment(category):
-    fragments = Fragment.objects.filter(category=category)
-    if not fragments.exists():
-        return ""
-    texts = [f.text for f in fragments]
-    weights = [f.weight for f in fragments]
-    return random.choices(texts, weights=weights, k=1)[0]
+    return fragment_sampler.pick(category)
 
 
 def pick_player(player_name=None):
@@ -212,11 +516,19 @@ def pick_player(player_name=None):
         player = Player.objects.filter(name=player_name).first()
         if player:
             return player
-    return Player.objects.order_by("?").first()
+    return player_sampler.pick()
 
 
-def assemble_praise(player_name, intensity, force_nostalgia=False):
-    player = pick_player(player_name)
+def pick_players(player_name=None, count=1):
+    if player_name:
+        player = Player.objects.filter(name=player_name).first()
+        if player:
+            return [player] * count
+    players = player_sampler.sample(count, replace=True)
+    return players or [None] * count
+
+
+def compose_praise(player, intensity, force_nostalgia=False):
     name = player.name if player else "Arsenal"
     opener = pick_fragment("opener")
     praise = pick_fragment("praise")
@@ -235,33 +547,51 @@ def assemble_praise(player_name, intensity, force_nostalgia=False):
     return clean_text(text.strip()), player
 
 
-def generate_output(user, mode, player_name, intensity):
-    recent = list(
-        GeneratorHistory.objects.filter(user=user).order_by("-created_at").values_list("output_text", flat=True)[:20]
-    )
-    recent_set = set(recent)
-    attempt = 0
-    while attempt < 10:
-        attempt += 1
-        player = None
-        if mode == "fact":
-            fact = Fact.objects.order_by("?").first()
-            text = fact.text if fact else "Arsenal is the best club."
-        elif mode == "nostalgia":
-            text, player = assemble_praise(player_name, intensity, force_nostalgia=True)
-        else:
-            lines = PreGeneratedLine.objects.filter(intensity=intensity)
-            if player_name:
-                lines = lines.filter(player__name=player_name)
-            line = lines.order_by("?").first()
-            if line:
-                text = line.text
-                player = line.player
-            else:
-                text, player = assemble_praise(player_name, intensity, force_nostalgia=False)
+def assemble_praise(player_name, intensity, force_nostalgia=False):
+    return compose_praise(pick_player(player_name), intensity, force_nostalgia=force_nostalgia)
+
+
+def draw_candidates(mode, player_name, intensity, size):
+    if mode == "fact":
+        facts = fact_sampler.sample(size)
+        if not facts:
+            return [("Arsenal is the best club.", None)]
+        return [(fact.text, None) for fact in facts]
+    if mode == "nostalgia":
+        return [compose_praise(player, intensity, force_nostalgia=True) for player in pick_players(player_name, size)]
+    if player_name:
+        lines = line_sampler.sample(size, intensity=intensity, player__name=player_name)
+    else:
+        lines = line_sampler.sample(size, intensity=intensity)
+    candidates = [(line.text, line.player) for line in lines]
+    if len(candidates) < size:
+        players = pick_players(player_name, size - len(candidates))
+        candidates.extend(compose_praise(player, intensity) for player in players)
+    return candidates
+
+
+def generate_outputs(user, mode, player_name, intensity, count=1):
+    seen = recent_outputs.seen(user.id)
+    results = []
+    candidates = draw_candidates(mode, player_name, intensity, count * 2 + 10)
+    for text, player in candidates:
         text = clean_text(text)
-        if text not in recent_set:
-            GeneratorHistory.objects.create(user=user, output_text=text, mode=mode, player=player)
-            return text
-    GeneratorHistory.objects.create(user=user, output_text=text, mode=mode, player=player)
-    return text
+        digest = output_digest(text)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        results.append((text, player))
+        if len(results) == count:
+            break
+    if not results:
+        text, player = candidates[-1]
+        results.append((clean_text(text), player))
+    recent_outputs.record(user.id, [text for text, _ in results])
+    history_buffer.extend(
+        [GeneratorHistory(user=user, output_text=text, mode=mode, player=player) for text, player in results]
+    )
+    return [text for text, _ in results]
+
+
+def generate_output(user, mode, player_name, intensity):
+    return generate_outputs(user, mode, player_name, intensity)[0]
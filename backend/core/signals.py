@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import fixtures_cache
+from .chat import keyword_index
+from .models import (
+    Fragment,
+    Fact,
+    Player,
+    PreGeneratedLine,
+    FixturesCache,
+    KeywordResponse,
+    Honor,
+    TimelineItem,
+    InfoLink,
+    Profile,
+)
+from .profiles import profile_cache
+from .sampling import fragment_sampler, line_sampler, fact_sampler, player_sampler
+from .snapshots import content_snapshots
+
+
+@receiver([post_save, post_delete], sender=Fragment)
+def invalidate_fragment_sampler(sender, **kwargs):
+    fragment_sampler.invalidate()
+
+
+@receiver([post_save, post_delete], sender=PreGeneratedLine)
+def invalidate_line_sampler(sender, **kwargs):
+    line_sampler.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Fact)
+def invalidate_fact_sampler(sender, **kwargs):
+    fact_sampler.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Player)
+def invalidate_player_sampler(sender, **kwargs):
+    player_sampler.invalidate()
+    line_sampler.invalidate()
+    content_snapshots["players"].invalidate()
+
+
+@receiver([post_save, post_delete], sender=FixturesCache)
+def invalidate_fixtures_cache(sender, instance, **kwargs):
+    fixtures_cache.invalidate(instance.cache_key)
+
+
+@receiver([post_save, post_delete], sender=KeywordResponse)
+def invalidate_keyword_index(sender, **kwargs):
+    keyword_index.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Honor)
+def invalidate_honors_snapshot(sender, **kwargs):
+    content_snapshots["honors"].invalidate()
+
+
+@receiver([post_save, post_delete], sender=TimelineItem)
+def invalidate_timeline_snapshot(sender, **kwargs):
+    content_snapshots["timeline"].invalidate()
+
+
+@receiver([post_save, post_delete], sender=InfoLink)
+def invalidate_info_links_snapshot(sender, **kwargs):
+    content_snapshots["info"].invalidate()
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    transaction.on_commit(lambda: profile_cache.invalidate(instance.user_id))
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def advisory_lock(name, timeout=0):
+    if connection.vendor != "postgresql":
+        yield True
+        return
+    lock_id = zlib.crc32(name.encode("utf-8"))
+    deadline = time.monotonic() + timeout
+    acquired = False
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [lock_id])
+            acquired = cursor.fetchone()[0]
+            if acquired or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, wait_timeout):
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, stale=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            return self._follow(call, fn, stale)
+        try:
+            call.result = self._lead(key, fn, stale)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _follow(self, call, fn, stale):
+        if stale is not None:
+            value = stale()
+            if value is not None:
+                return value
+        if not call.done.wait(self.wait_timeout):
+            return fn()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _lead(self, key, fn, stale):
+        with advisory_lock(f"singleflight:{key}") as acquired:
+            if acquired:
+                return fn()
+        if stale is not None:
+            value = stale()
+            if value is not None:
+                return value
+        with advisory_lock(f"singleflight:{key}", timeout=self.wait_timeout):
+            return fn()
+
+
+class BackgroundRefresher:
+    def __init__(self, flight, max_workers=2):
+        self.flight = flight
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def submit(self, key, fn):
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        self._executor.submit(self._run, key, fn)
+        return True
+
+    def _run(self, key, fn):
+        try:
+            self.flight.do(key, fn)
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+            close_old_connections()
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key, fn):
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            calls[key] = task
+            task.add_done_callback(lambda _: calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+upstream_flight = SingleFlight(settings.UPSTREAM_WAIT_TIMEOUT_SECONDS)
+async_flight = AsyncSingleFlight()
+background_refresher = BackgroundRefresher(upstream_flight)
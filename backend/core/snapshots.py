@@ -0,0 +1,91 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from .models import Honor, InfoLink, Player, TimelineItem
+from .serializers import HonorSerializer, InfoLinkSerializer, PlayerSerializer, TimelineSerializer
+
+
+MODES = [
+    {"id": "fact", "label": "Random Arsenal Fact"},
+    {"id": "praise", "label": "Player Praise"},
+    {"id": "nostalgia", "label": "Deep Fan / Nostalgia"},
+]
+
+DEFAULT_HONORS = [
+    {"id": 1, "title": "League Titles", "count": "13x", "subtitle": "Top-flight Champions"},
+    {"id": 2, "title": "FA Cup Trophies", "count": "14x", "subtitle": "Record Winners"},
+    {"id": 3, "title": "The Invincibles", "count": "2003/04", "subtitle": "Unbeaten League Season"},
+]
+
+DEFAULT_TIMELINE = [
+    {"id": 1, "title": "Woolwich Origins", "period": "1886", "description": "Founded in Woolwich and built from humble roots."},
+    {"id": 2, "title": "Highbury Era", "period": "1913–2006", "description": "A historic home that shaped the club's identity."},
+    {"id": 3, "title": "Emirates Stadium", "period": "2006–Present", "description": "Modern home with elite ambitions."},
+    {"id": 4, "title": "Wenger Era", "period": "1996–2018", "description": "Style, trophies, and a global football legacy."},
+    {"id": 5, "title": "Arteta Era", "period": "2019–Present", "description": "Control, youth, and a new Arsenal standard."},
+]
+
+DEFAULT_INFO_LINKS = [
+    {"id": 1, "title": "Arsenal Official Website", "url": "https://www.arsenal.com/"},
+    {"id": 2, "title": "Arsenal on BBC Sport", "url": "https://www.bbc.com/sport/football/teams/arsenal"},
+    {"id": 3, "title": "Arsenal on Sky Sports", "url": "https://www.skysports.com/arsenal"},
+    {"id": 4, "title": "Arsenal Fixtures and Results", "url": "https://www.premierleague.com/clubs/1/Arsenal/fixtures"},
+]
+
+
+def build_players():
+    return PlayerSerializer(Player.objects.order_by("name"), many=True).data
+
+
+def build_modes():
+    return MODES
+
+
+def build_honors():
+    return HonorSerializer(Honor.objects.all(), many=True).data or DEFAULT_HONORS
+
+
+def build_timeline():
+    return TimelineSerializer(TimelineItem.objects.all(), many=True).data or DEFAULT_TIMELINE
+
+
+def build_info_links():
+    return InfoLinkSerializer(InfoLink.objects.all(), many=True).data or DEFAULT_INFO_LINKS
+
+
+class Snapshot:
+    def __init__(self, build, ttl):
+        self.build = build
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._current = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._current = None
+            self._expires_at = 0.0
+
+    def get(self):
+        current = self._current
+        if current is not None and time.monotonic() < self._expires_at:
+            return current
+        with self._lock:
+            if self._current is None or time.monotonic() >= self._expires_at:
+                data = self.build()
+                body = JSONRenderer().render(data)
+                etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+                self._current = (data, body, etag)
+                self._expires_at = time.monotonic() + self.ttl
+            return self._current
+
+
+content_snapshots = {
+    "players": Snapshot(build_players, settings.CONTENT_SNAPSHOT_TTL_SECONDS),
+    "modes": Snapshot(build_modes, settings.CONTENT_SNAPSHOT_TTL_SECONDS),
+    "honors": Snapshot(build_honors, settings.CONTENT_SNAPSHOT_TTL_SECONDS),
+    "timeline": Snapshot(build_timeline, settings.CONTENT_SNAPSHOT_TTL_SECONDS),
+    "info": Snapshot(build_info_links, settings.CONTENT_SNAPSHOT_TTL_SECONDS),
+}
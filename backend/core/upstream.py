@@ -0,0 +1,214 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class UpstreamClient:
+    def __init__(self, base_url, headers=None, retries=None, pool_size=None, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries or settings.UPSTREAM_RETRIES
+        self.timeout = (settings.UPSTREAM_CONNECT_TIMEOUT, settings.UPSTREAM_READ_TIMEOUT)
+        self.breaker = breaker or CircuitBreaker(
+            settings.UPSTREAM_BREAKER_THRESHOLD, settings.UPSTREAM_BREAKER_RESET_SECONDS
+        )
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or settings.UPSTREAM_POOL_SIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, settings.UPSTREAM_BACKOFF_MAX_SECONDS)
+        ceiling = min(settings.UPSTREAM_BACKOFF_MAX_SECONDS, settings.UPSTREAM_BACKOFF_SECONDS * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def get(self, path, params=None, headers=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.base_url}")
+        last_error = None
+        last_response = None
+        retry_after = None
+        for attempt in range(self.retries):
+            if attempt:
+                time.sleep(self.backoff(attempt - 1, retry_after))
+            retry_after = None
+            try:
+                response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                last_error = exc
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+            last_response = response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None and retry_after > settings.UPSTREAM_BACKOFF_MAX_SECONDS:
+                break
+        self.breaker.record_failure()
+        if last_response is not None:
+            return last_response
+        raise UpstreamError(str(last_error)) from last_error
+
+
+class AsyncUpstreamClient(UpstreamClient):
+    def __init__(self, base_url, headers=None, retries=None, pool_size=None, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries or settings.UPSTREAM_RETRIES
+        self.breaker = breaker or CircuitBreaker(
+            settings.UPSTREAM_BREAKER_THRESHOLD, settings.UPSTREAM_BREAKER_RESET_SECONDS
+        )
+        pool_size = pool_size or settings.UPSTREAM_POOL_SIZE
+        self.session = httpx.AsyncClient(
+            headers=headers or {},
+            timeout=httpx.Timeout(settings.UPSTREAM_READ_TIMEOUT, connect=settings.UPSTREAM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def get(self, path, params=None, headers=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.base_url}")
+        last_error = None
+        last_response = None
+        retry_after = None
+        for attempt in range(self.retries):
+            if attempt:
+                await asyncio.sleep(self.backoff(attempt - 1, retry_after))
+            retry_after = None
+            try:
+                response = await self.session.get(f"{self.base_url}{path}", params=params, headers=headers)
+            except httpx.HTTPError as exc:
+                last_error = exc
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+            last_response = response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None and retry_after > settings.UPSTREAM_BACKOFF_MAX_SECONDS:
+                break
+        self.breaker.record_failure()
+        if last_response is not None:
+            return last_response
+        raise UpstreamError(str(last_error)) from last_error
+
+    async def aclose(self):
+        await self.session.aclose()
+
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()
+_breakers = {}
+_clients_lock = threading.Lock()
+
+
+def get_breaker(name):
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(settings.UPSTREAM_BREAKER_THRESHOLD, settings.UPSTREAM_BREAKER_RESET_SECONDS)
+        _breakers[name] = breaker
+    return breaker
+
+
+def get_client(name, base_url, headers=None, retries=None):
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None or client.base_url != base_url.rstrip("/"):
+            client = UpstreamClient(base_url, headers=headers, retries=retries, breaker=get_breaker(name))
+            _clients[name] = client
+        return client
+
+
+def get_async_client(name, base_url, headers=None, retries=None):
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(name)
+    if client is None or client.base_url != base_url.rstrip("/"):
+        with _clients_lock:
+            breaker = get_breaker(name)
+        client = AsyncUpstreamClient(base_url, headers=headers, retries=retries, breaker=breaker)
+        clients[name] = client
+    return client
+
+
+async def aclose_clients():
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def football_data_headers():
+    return {
+        "X-Auth-Token": settings.FOOTBALL_DATA_API_KEY,
+        "User-Agent": "ArsenalAura/1.0 (+https://arsenalaura.vercel.app/)",
+    }
+
+
+def football_data_client():
+    return get_client("football-data", settings.FOOTBALL_DATA_BASE_URL, headers=football_data_headers())
+
+
+def sportsdb_client():
+    return get_client("sportsdb", f"{settings.SPORTS_DB_BASE_URL}/{settings.SPORTS_DB_API_KEY}", retries=2)
+
+
+def async_football_data_client():
+    return get_async_client("football-data", settings.FOOTBALL_DATA_BASE_URL, headers=football_data_headers())
+
+
+def async_sportsdb_client():
+    return get_async_client("sportsdb", f"{settings.SPORTS_DB_BASE_URL}/{settings.SPORTS_DB_API_KEY}", retries=2)
@@ -1,10 +1,13 @@
+from django.conf import settings
 from django.urls import path
+from .async_views import next_fixture_view, prediction_check_view
 from .views import (
     RegisterView,
     LoginView,
     RefreshView,
     BootstrapAdminView,
     MeView,
+    BootstrapView,
     PlayersView,
     ModesView,
     GenerateView,
@@ -12,6 +15,8 @@ from .views import (
     PredictionCreateView,
     PredictionLatestView,
     PredictionCheckView,
+    LeaderboardView,
+    LeaderboardMeView,
     HonorsView,
     TimelineView,
     InfoLinksView,
@@ -25,13 +30,19 @@ urlpatterns = [
     path("auth/refresh", RefreshView.as_view()),
     path("auth/bootstrap", BootstrapAdminView.as_view()),
     path("me", MeView.as_view()),
+    path("bootstrap", BootstrapView.as_view()),
     path("players", PlayersView.as_view()),
     path("modes", ModesView.as_view()),
     path("generate", GenerateView.as_view()),
-    path("fixtures/next", NextFixtureView.as_view()),
+    path("fixtures/next", next_fixture_view if settings.ASYNC_VIEWS else NextFixtureView.as_view()),
     path("predictions", PredictionCreateView.as_view()),
     path("predictions/latest", PredictionLatestView.as_view()),
-    path("predictions/<int:pk>/check", PredictionCheckView.as_view()),
+    path(
+        "predictions/<int:pk>/check",
+        prediction_check_view if settings.ASYNC_VIEWS else PredictionCheckView.as_view(),
+    ),
+    path("leaderboard", LeaderboardView.as_view()),
+    path("leaderboard/me", LeaderboardMeView.as_view()),
     path("info/honors", HonorsView.as_view()),
     path("info/timeline", TimelineView.as_view()),
     path("info/links", InfoLinksView.as_view()),
@@ -1,38 +1,54 @@
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.http import parse_etags
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.throttling import ScopedRateThrottle
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import (
     Profile,
-    Player,
     Prediction,
     UserStats,
-    Honor,
-    TimelineItem,
-    InfoLink,
-    KeywordResponse,
     ChatMessage,
     FAVORITE_CLUB_CHOICES,
 )
 from .serializers import (
     RegisterSerializer,
-    PlayerSerializer,
     PredictionCreateSerializer,
     PredictionSerializer,
-    HonorSerializer,
-    TimelineSerializer,
-    InfoLinkSerializer,
     ChatRequestSerializer,
     GenerateSerializer,
+    LeaderboardEntrySerializer,
+    LeaderboardQuerySerializer,
 )
+from . import leaderboard
+from .authentication import stamp_profile, tokens_for_user
+from .chat import keyword_index
+from .snapshots import content_snapshots
+from .writebehind import chat_buffer
 from .permissions import IsArsenalAllowed
-from .services import generate_output, get_next_match, get_match_result, get_team_badge
+from .profiles import DEFAULT_PROFILE, ensure_profile, profile_cache
+from .bootstrap import gather
+from .services import generate_outputs, next_fixture, settle_match, prediction_message
+
+
+def snapshot_response(request, name):
+    _, body, etag = content_snapshots[name].get()
+    tags = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in tags or "*" in tags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = f"private, max-age={settings.CONTENT_MAX_AGE_SECONDS}"
+    return response
 
 
 class RegisterView(APIView):
@@ -43,7 +59,9 @@ class RegisterView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(
+            user, {"favorite_club": user.profile.favorite_club, "banter_mode": user.profile.banter_mode}
+        )
         response = Response(
             {
                 "access": str(refresh.access_token),
@@ -98,19 +116,16 @@ class LoginView(APIView):
         user = authenticate(request, username=email, password=password)
         if not user:
             return Response({"detail": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
-        profile, _ = Profile.objects.get_or_create(
-            user=user,
-            defaults={"favorite_club": "Arsenal", "banter_mode": False},
-        )
-        refresh = RefreshToken.for_user(user)
+        profile = ensure_profile(user)
+        refresh = tokens_for_user(user, profile)
         response = Response(
             {
                 "access": str(refresh.access_token),
                 "user": {
                     "id": user.id,
                     "email": user.email,
-                    "favorite_club": profile.favorite_club,
-                    "banter_mode": profile.banter_mode,
+                    "favorite_club": profile["favorite_club"],
+                    "banter_mode": profile["banter_mode"],
                 },
             }
         )
@@ -133,67 +148,90 @@ class RefreshView(APIView):
             return Response({"detail": "Missing refresh token."}, status=status.HTTP_401_UNAUTHORIZED)
         try:
             refresh = RefreshToken(token)
-            access = str(refresh.access_token)
+            access = refresh.access_token
         except Exception:
             return Response({"detail": "Invalid refresh token."}, status=status.HTTP_401_UNAUTHORIZED)
-        return Response({"access": access})
+        profile = profile_cache.get(refresh[api_settings.USER_ID_CLAIM])
+        if profile:
+            stamp_profile(access, profile)
+        return Response({"access": str(access)})
+
+
+def me_payload(user):
+    profile = profile_cache.get(user.id) or DEFAULT_PROFILE
+    return {
+        "id": user.id,
+        "email": user.email,
+        "favorite_club": profile["favorite_club"],
+        "banter_mode": profile["banter_mode"],
+    }
+
+
+def latest_prediction(user):
+    prediction = Prediction.objects.filter(user=user).order_by("-created_at").first()
+    if not prediction:
+        return {}
+    return PredictionSerializer(prediction).data
 
 
 class MeView(APIView):
     def get(self, request):
-        profile, _ = Profile.objects.get_or_create(
-            user=request.user,
-            defaults={"favorite_club": "Arsenal", "banter_mode": False},
-        )
-        data = {
-            "id": request.user.id,
-            "email": request.user.email,
-            "favorite_club": profile.favorite_club,
-            "banter_mode": profile.banter_mode,
-        }
-        return Response(data)
+        return Response(me_payload(request.user))
 
     def patch(self, request):
-        profile, _ = Profile.objects.get_or_create(
-            user=request.user,
-            defaults={"favorite_club": "Arsenal", "banter_mode": False},
-        )
+        profile, _ = Profile.objects.get_or_create(user=request.user, defaults=DEFAULT_PROFILE)
         favorite_club = request.data.get("favorite_club")
         if favorite_club:
             valid_clubs = [c[0] for c in FAVORITE_CLUB_CHOICES]
             if favorite_club not in valid_clubs:
                 return Response({"detail": "Invalid club."}, status=status.HTTP_400_BAD_REQUEST)
+            previous_club = profile.favorite_club
             profile.favorite_club = favorite_club
             profile.banter_mode = favorite_club in ["Tottenham Hotspur", "Chelsea"]
             profile.save()
+            leaderboard.move_club(request.user.id, previous_club, favorite_club)
         data = {
             "id": request.user.id,
             "email": request.user.email,
             "favorite_club": profile.favorite_club,
             "banter_mode": profile.banter_mode,
         }
+        data["access"] = str(tokens_for_user(request.user, data).access_token)
         return Response(data)
 
 
+class BootstrapView(APIView):
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "bootstrap"
+
+    def get(self, request):
+        data = {"me": me_payload(request.user)}
+        if not IsArsenalAllowed().has_permission(request, self):
+            sections = ["players", "modes", "fixture", "prediction", "honors", "timeline", "info"]
+            return Response({**data, **dict.fromkeys(sections), "errors": dict.fromkeys(sections, IsArsenalAllowed.message)})
+        results, errors = gather(
+            {"fixture": (next_fixture,), "prediction": (latest_prediction, request.user)},
+            settings.BOOTSTRAP_TIMEOUT_SECONDS,
+        )
+        for name in ["players", "modes", "honors", "timeline", "info"]:
+            data[name] = content_snapshots[name].get()[0]
+        return Response({**data, **results, "errors": errors})
+
+
 class PlayersView(APIView):
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        players = Player.objects.order_by("name")
-        return Response(PlayerSerializer(players, many=True).data)
+        return snapshot_response(request, "players")
 
 
 class ModesView(APIView):
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        return Response(
-            [
-                {"id": "fact", "label": "Random Arsenal Fact"},
-                {"id": "praise", "label": "Player Praise"},
-                {"id": "nostalgia", "label": "Deep Fan / Nostalgia"},
-            ]
-        )
+        return snapshot_response(request, "modes")
 
 
 class GenerateView(APIView):
@@ -208,8 +246,9 @@ class GenerateView(APIView):
         mode = serializer.validated_data["mode"]
         intensity = serializer.validated_data["intensity"]
         player = serializer.validated_data.get("player")
-        text = generate_output(request.user, mode, player, intensity)
-        return Response({"text": text})
+        count = serializer.validated_data["count"]
+        texts = generate_outputs(request.user, mode, player, intensity, count)
+        return Response({"text": texts[0], "texts": texts})
 
 
 class NextFixtureView(APIView):
@@ -218,39 +257,7 @@ class NextFixtureView(APIView):
     throttle_scope = "fixtures"
 
     def get(self, request):
-        data = get_next_match()
-        if data.get("error"):
-            return Response({"unavailable": True, "detail": data["error"]})
-        home_team = data.get("homeTeam")
-        away_team = data.get("awayTeam")
-        utc_date = data.get("utcDate")
-        if not data.get("match_id") or not home_team or not away_team or not utc_date:
-            return Response({"unavailable": True, "detail": "Match data incomplete."})
-
-        def is_arsenal(name):
-            return name and "Arsenal" in name
-
-        arsenal_is_home = is_arsenal(home_team)
-        opponent = away_team if arsenal_is_home else home_team
-        if is_arsenal(opponent):
-            return Response({"unavailable": True, "detail": "Opponent data unavailable."})
-        home_badge = get_team_badge(home_team)
-        away_badge = get_team_badge(away_team)
-        return Response(
-            {
-                "match_id": data.get("match_id"),
-                "utcDate": utc_date,
-                "competition": data.get("competition"),
-                "homeTeam": home_team,
-                "awayTeam": away_team,
-                "homeBadge": home_badge,
-                "awayBadge": away_badge,
-                "status": data.get("status"),
-                "arsenal_is_home": arsenal_is_home,
-                "opponent": opponent,
-                "stale": data.get("stale", False),
-            }
-        )
+        return Response(next_fixture())
 
 
 class PredictionCreateView(APIView):
@@ -294,151 +301,112 @@ class PredictionLatestView(APIView):
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        prediction = Prediction.objects.filter(user=request.user).order_by("-created_at").first()
-        if not prediction:
-            return Response({})
-        return Response(PredictionSerializer(prediction).data)
+        return Response(latest_prediction(request.user))
+
+
+def start_check(pk, user):
+    prediction = Prediction.objects.filter(id=pk, user=user).first()
+    if prediction and prediction.kickoff <= timezone.now() and not prediction.locked:
+        Prediction.objects.filter(id=prediction.id, locked=False).update(locked=True)
+        prediction.locked = True
+    return prediction
+
+
+def check_payload(prediction):
+    points = prediction.points
+    color = "green" if points == 3 else "yellow" if points == 1 else "red"
+    return {
+        "prediction": PredictionSerializer(prediction).data,
+        "points": points,
+        "message": prediction_message(prediction),
+        "result_color": color,
+    }
 
 
 class PredictionCheckView(APIView):
     permission_classes = [IsArsenalAllowed]
 
     def post(self, request, pk):
-        prediction = Prediction.objects.filter(id=pk, user=request.user).first()
+        prediction = start_check(pk, request.user)
         if not prediction:
             return Response({"detail": "Prediction not found."}, status=status.HTTP_404_NOT_FOUND)
-        if prediction.kickoff <= timezone.now():
-            prediction.locked = True
-            prediction.save()
-        match = get_match_result(prediction.match_id)
-        if match.get("error"):
-            return Response({"detail": match["error"]}, status=status.HTTP_502_BAD_GATEWAY)
-        if match.get("status") != "FINISHED":
-            return Response({"detail": "Match not finished yet."}, status=status.HTTP_400_BAD_REQUEST)
-        score = match.get("score", {}).get("fullTime", {})
-        home_score = score.get("home")
-        away_score = score.get("away")
-        if home_score is None or away_score is None:
-            return Response({"detail": "Score not available."}, status=status.HTTP_400_BAD_REQUEST)
-        prediction.actual_home = home_score
-        prediction.actual_away = away_score
-        prediction.checked_at = timezone.now()
-
-        arsenal_goals = home_score if prediction.arsenal_is_home else away_score
-        opponent_goals = away_score if prediction.arsenal_is_home else home_score
-        predicted_arsenal = prediction.predicted_home
-        predicted_opponent = prediction.predicted_away
-
-        exact = arsenal_goals == predicted_arsenal and opponent_goals == predicted_opponent
-        outcome = (
-            (arsenal_goals > opponent_goals and predicted_arsenal > predicted_opponent)
-            or (arsenal_goals == opponent_goals and predicted_arsenal == predicted_opponent)
-            or (arsenal_goals < opponent_goals and predicted_arsenal < predicted_opponent)
-        )
-        if exact:
-            points = 3
-        elif outcome:
-            points = 1
-        else:
-            points = 0
-        prediction.points = points
-        prediction.save()
-
-        stats = UserStats.objects.get(user=request.user)
-        stats.total_predictions += 1
-        if points > 0:
-            stats.correct_predictions += 1
-            stats.streak += 1
-        else:
-            stats.streak = 0
-        stats.total_points += points
-        stats.accuracy = round((stats.correct_predictions / stats.total_predictions) * 100, 2)
-        stats.save()
-
-        arsenal_won = arsenal_goals > opponent_goals
-        arsenal_draw = arsenal_goals == opponent_goals
-        if arsenal_won:
-            if exact:
-                message = "Emirates prophet. You saw it all coming."
-            elif outcome:
-                message = "Ball knowledge detected. You called the result."
-            else:
-                message = "Win secured, but the scoreline got away from you."
-        elif arsenal_draw:
-            if exact:
-                message = "You read the stalemate perfectly."
-            elif outcome:
-                message = "Draw vibes felt. Solid call."
-            else:
-                message = "The draw came, but your numbers were bold."
+        if not prediction.checked_at:
+            result = settle_match(prediction.match_id)
+            if result.get("error"):
+                return Response({"detail": result["error"]}, status=result["status"])
+            prediction.refresh_from_db()
+        return Response(check_payload(prediction))
+
+
+class LeaderboardView(APIView):
+    permission_classes = [IsArsenalAllowed]
+
+    def get(self, request):
+        serializer = LeaderboardQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        if data["scope"] == "club":
+            club = data.get("club")
+            if not club:
+                club = (profile_cache.get(request.user.id) or DEFAULT_PROFILE)["favorite_club"]
+            scope = leaderboard.club_scope(club)
+        elif data["scope"] == "season":
+            scope = leaderboard.season_scope(data.get("season") or leaderboard.current_season())
         else:
-            if exact:
-                message = "Unlucky exact call. You sensed the wrong way."
-            elif outcome:
-                message = "You predicted the pain. Gooner resilience."
-            else:
-                message = "You jinxed it, gooner. We go again."
-
-        color = "green" if points == 3 else "yellow" if points == 1 else "red"
+            scope = leaderboard.GLOBAL_SCOPE
+        entries, has_next = leaderboard.get_page(scope, data["page"], data["page_size"])
         return Response(
             {
-                "prediction": PredictionSerializer(prediction).data,
-                "points": points,
-                "message": message,
-                "result_color": color,
+                "scope": scope,
+                "page": data["page"],
+                "page_size": data["page_size"],
+                "has_next": has_next,
+                "results": LeaderboardEntrySerializer(entries, many=True).data,
             }
         )
 
 
+class LeaderboardMeView(APIView):
+    permission_classes = [IsArsenalAllowed]
+
+    def get(self, request):
+        profile = profile_cache.get(request.user.id)
+        scopes = {
+            "global": leaderboard.GLOBAL_SCOPE,
+            "season": leaderboard.season_scope(leaderboard.current_season()),
+        }
+        if profile:
+            scopes["club"] = leaderboard.club_scope(profile["favorite_club"])
+        data = {}
+        for name, scope in scopes.items():
+            entry = leaderboard.get_entry(scope, request.user.id)
+            data[name] = {"scope": scope, **LeaderboardEntrySerializer(entry).data} if entry else None
+        return Response(data)
+
+
 class HonorsView(APIView):
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        honors = Honor.objects.all()
-        if not honors.exists():
-            return Response(
-                [
-                    {"id": 1, "title": "League Titles", "count": "13x", "subtitle": "Top-flight Champions"},
-                    {"id": 2, "title": "FA Cup Trophies", "count": "14x", "subtitle": "Record Winners"},
-                    {"id": 3, "title": "The Invincibles", "count": "2003/04", "subtitle": "Unbeaten League Season"},
-                ]
-            )
-        return Response(HonorSerializer(honors, many=True).data)
+        return snapshot_response(request, "honors")
 
 
 class TimelineView(APIView):
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        items = TimelineItem.objects.all()
-        if not items.exists():
-            return Response(
-                [
-                    {"id": 1, "title": "Woolwich Origins", "period": "1886", "description": "Founded in Woolwich and built from humble roots."},
-                    {"id": 2, "title": "Highbury Era", "period": "1913–2006", "description": "A historic home that shaped the club's identity."},
-                    {"id": 3, "title": "Emirates Stadium", "period": "2006–Present", "description": "Modern home with elite ambitions."},
-                    {"id": 4, "title": "Wenger Era", "period": "1996–2018", "description": "Style, trophies, and a global football legacy."},
-                    {"id": 5, "title": "Arteta Era", "period": "2019–Present", "description": "Control, youth, and a new Arsenal standard."},
-                ]
-            )
-        return Response(TimelineSerializer(items, many=True).data)
+        return snapshot_response(request, "timeline")
 
 
 class InfoLinksView(APIView):
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsArsenalAllowed]
 
     def get(self, request):
-        links = InfoLink.objects.all()
-        if not links.exists():
-            return Response(
-                [
-                    {"id": 1, "title": "Arsenal Official Website", "url": "https://www.arsenal.com/"},
-                    {"id": 2, "title": "Arsenal on BBC Sport", "url": "https://www.bbc.com/sport/football/teams/arsenal"},
-                    {"id": 3, "title": "Arsenal on Sky Sports", "url": "https://www.skysports.com/arsenal"},
-                    {"id": 4, "title": "Arsenal Fixtures and Results", "url": "https://www.premierleague.com/clubs/1/Arsenal/fixtures"},
-                ]
-            )
-        return Response(InfoLinkSerializer(links, many=True).data)
+        return snapshot_response(request, "info")
 
 
 class ChatView(APIView):
@@ -450,17 +418,11 @@ class ChatView(APIView):
         serializer = ChatRequestSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        message = serializer.validated_data["message"].lower()
-        matches = []
-        for item in KeywordResponse.objects.all():
-            if item.keyword.lower() in message:
-                matches.append(item)
-        if matches:
-            matches_sorted = sorted(matches, key=lambda x: len(x.keyword), reverse=True)
-            best = matches_sorted[:2]
-            response_text = " ".join([b.response for b in best])
-        else:
-            response_text = "Arsenal is the best club."
-        ChatMessage.objects.create(user=request.user, role="user", text=serializer.validated_data["message"])
-        ChatMessage.objects.create(user=request.user, role="bot", text=response_text)
+        response_text = keyword_index.reply(serializer.validated_data["message"])
+        chat_buffer.extend(
+            [
+                ChatMessage(user=request.user, role="user", text=serializer.validated_data["message"]),
+                ChatMessage(user=request.user, role="bot", text=response_text),
+            ]
+        )
         return Response({"reply": response_text})
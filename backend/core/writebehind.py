@@ -0,0 +1,125 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+from .models import ChatMessage, GeneratorHistory
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, model):
+        self.model = model
+        self.batch_size = settings.WRITE_BEHIND_BATCH_SIZE
+        self.flush_interval = settings.WRITE_BEHIND_FLUSH_SECONDS
+        self.policy = settings.WRITE_BEHIND_POLICY
+        self.retries = settings.WRITE_BEHIND_RETRIES
+        self.retry_delay = settings.WRITE_BEHIND_RETRY_SECONDS
+        self.queue = queue.Queue(maxsize=settings.WRITE_BEHIND_MAX_QUEUE)
+        self.written = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    def extend(self, objs):
+        if not settings.WRITE_BEHIND_ENABLED:
+            self.model.objects.bulk_create(objs)
+            return
+        self._ensure_started()
+        for obj in objs:
+            try:
+                if self.policy == "block":
+                    self.queue.put(obj, timeout=settings.WRITE_BEHIND_BLOCK_SECONDS)
+                else:
+                    self.queue.put_nowait(obj)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                logger.warning("Write-behind queue for %s is full, dropping row", self.model.__name__)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"write-behind-{self.model.__name__}", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping.is_set():
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _insert(self, batch):
+        for attempt in range(self.retries):
+            try:
+                return self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+            except OperationalError as exc:
+                logger.warning("Write-behind flush for %s failed (%s), retrying", self.model.__name__, exc)
+                time.sleep(self.retry_delay * (2 ** attempt))
+                close_old_connections()
+        return self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+
+    def _write(self, batch):
+        close_old_connections()
+        try:
+            self._insert(batch)
+            with self._lock:
+                self.written += len(batch)
+        except Exception:
+            with self._lock:
+                self.dropped += len(batch)
+            logger.exception("Write-behind flush for %s failed", self.model.__name__)
+
+    def close(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(self.flush_interval * 2)
+        self.flush()
+
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+
+history_buffer = WriteBehindBuffer(GeneratorHistory)
+chat_buffer = WriteBehindBuffer(ChatMessage)
+
+
+@atexit.register
+def close_buffers():
+    for buffer in (history_buffer, chat_buffer):
+        buffer.close()
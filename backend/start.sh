@@ -1,6 +1,16 @@
 set -e
 echo "PORT=${PORT:-8000}"
 python manage.py migrate
+python manage.py prune_cache || true
+python manage.py prune_history &
+python manage.py rebuild_leaderboard --if-empty || true
 python manage.py seed &
+python manage.py sync_fixtures --loop &
+python manage.py warm_cache --loop &
+python manage.py prewarm_badges &
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  echo "Starting gunicorn (uvicorn workers) on ${PORT:-8000}"
+  exec python -m gunicorn arsenal_aura.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000} --workers 1
+fi
 echo "Starting gunicorn on ${PORT:-8000}"
 exec python -m gunicorn arsenal_aura.wsgi:application --bind 0.0.0.0:${PORT:-8000} --workers 1
@@ -1,4 +1,4 @@
-import { createContext, useContext, useEffect, useMemo, useState } from "react";
+import { createContext, useContext, useEffect, useMemo, useRef, useState } from "react";
 import { apiFetch } from "../api";
 
 const AuthContext = createContext(null);
@@ -7,17 +7,31 @@ export function AuthProvider({ children }) {
   const [accessToken, setAccessToken] = useState("");
   const [user, setUser] = useState(null);
   const [loading, setLoading] = useState(true);
+  const bootstrapRef = useRef({});
 
-  const loadMe = async (token) => {
-    const data = await apiFetch("/api/me", { method: "GET" }, token);
-    setUser(data);
+  const loadSession = async (token) => {
+    try {
+      const { me, errors, ...sections } = await apiFetch("/api/bootstrap", { method: "GET" }, token);
+      bootstrapRef.current = sections;
+      setUser(me);
+    } catch {
+      bootstrapRef.current = {};
+      const data = await apiFetch("/api/me", { method: "GET" }, token);
+      setUser(data);
+    }
+  };
+
+  const takeBootstrap = (name) => {
+    const section = bootstrapRef.current[name] ?? null;
+    delete bootstrapRef.current[name];
+    return section;
   };
 
   const refresh = async () => {
     try {
       const data = await apiFetch("/api/auth/refresh", { method: "POST", body: "{}" });
       setAccessToken(data.access);
-      await loadMe(data.access);
+      await loadSession(data.access);
       return true;
     } catch {
       setAccessToken("");
@@ -37,6 +51,7 @@ export function AuthProvider({ children }) {
     });
     setAccessToken(data.access);
     setUser(data.user);
+    await loadSession(data.access).catch(() => {});
     return data.user;
   };
 
@@ -49,6 +64,7 @@ export function AuthProvider({ children }) {
   };
 
   const logout = () => {
+    bootstrapRef.current = {};
     setAccessToken("");
     setUser(null);
   };
@@ -59,8 +75,11 @@ export function AuthProvider({ children }) {
       { method: "PATCH", body: JSON.stringify({ favorite_club }) },
       accessToken
     );
-    setUser(data);
-    return data;
+    const { access, ...profile } = data;
+    bootstrapRef.current = {};
+    if (access) setAccessToken(access);
+    setUser(profile);
+    return profile;
   };
 
   const value = useMemo(
@@ -72,6 +91,7 @@ export function AuthProvider({ children }) {
       register,
       logout,
       refresh,
+      takeBootstrap,
       updateFavoriteClub
     }),
     [accessToken, user, loading]
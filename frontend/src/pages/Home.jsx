@@ -4,7 +4,7 @@ import { useAuth } from "../context/AuthContext";
 import { useToast } from "../context/ToastContext";
 
 export default function Home() {
-  const { accessToken } = useAuth();
+  const { accessToken, takeBootstrap } = useAuth();
   const { addToast } = useToast();
   const [modes, setModes] = useState([]);
   const [players, setPlayers] = useState([]);
@@ -16,9 +16,10 @@ export default function Home() {
   useEffect(() => {
     const load = async () => {
       try {
-        const modesData = await apiFetch("/api/modes", { method: "GET" }, accessToken);
+        const modesData = takeBootstrap("modes") || (await apiFetch("/api/modes", { method: "GET" }, accessToken));
         setModes(modesData);
-        const playersData = await apiFetch("/api/players", { method: "GET" }, accessToken);
+        const playersData =
+          takeBootstrap("players") || (await apiFetch("/api/players", { method: "GET" }, accessToken));
         setPlayers(playersData);
       } catch (e) {
         addToast(e.message, "error");
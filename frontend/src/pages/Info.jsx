@@ -4,7 +4,7 @@ import { useAuth } from "../context/AuthContext";
 import { useToast } from "../context/ToastContext";
 
 export default function Info() {
-  const { accessToken } = useAuth();
+  const { accessToken, takeBootstrap } = useAuth();
   const { addToast } = useToast();
   const [honors, setHonors] = useState([]);
   const [timeline, setTimeline] = useState([]);
@@ -15,9 +15,11 @@ export default function Info() {
   useEffect(() => {
     const load = async () => {
       try {
-        const honorsData = await apiFetch("/api/info/honors", { method: "GET" }, accessToken);
-        const timelineData = await apiFetch("/api/info/timeline", { method: "GET" }, accessToken);
-        const linksData = await apiFetch("/api/info/links", { method: "GET" }, accessToken);
+        const honorsData =
+          takeBootstrap("honors") || (await apiFetch("/api/info/honors", { method: "GET" }, accessToken));
+        const timelineData =
+          takeBootstrap("timeline") || (await apiFetch("/api/info/timeline", { method: "GET" }, accessToken));
+        const linksData = takeBootstrap("info") || (await apiFetch("/api/info/links", { method: "GET" }, accessToken));
         setHonors(honorsData);
         setTimeline(timelineData);
         setLinks(linksData);
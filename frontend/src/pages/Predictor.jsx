@@ -4,7 +4,7 @@ import { useAuth } from "../context/AuthContext";
 import { useToast } from "../context/ToastContext";
 
 export default function Predictor() {
-  const { accessToken } = useAuth();
+  const { accessToken, takeBootstrap } = useAuth();
   const { addToast } = useToast();
   const [match, setMatch] = useState(null);
   const [prediction, setPrediction] = useState(null);
@@ -20,7 +20,7 @@ export default function Predictor() {
   useEffect(() => {
     const load = async () => {
       try {
-        const next = await apiFetch("/api/fixtures/next", { method: "GET" }, accessToken);
+        const next = takeBootstrap("fixture") || (await apiFetch("/api/fixtures/next", { method: "GET" }, accessToken));
         if (next?.unavailable || !next?.utcDate || !next?.opponent) {
           const cached = localStorage.getItem("arsenalNextMatch");
           if (cached) {
@@ -41,7 +41,8 @@ export default function Predictor() {
           setMatchError("");
           localStorage.setItem("arsenalNextMatch", JSON.stringify(next));
         }
-        const latest = await apiFetch("/api/predictions/latest", { method: "GET" }, accessToken);
+        const latest =
+          takeBootstrap("prediction") || (await apiFetch("/api/predictions/latest", { method: "GET" }, accessToken));
         if (latest?.id) {
           setPrediction(latest);
           setHomeScore(latest.predicted_home);